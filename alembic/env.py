@@ -0,0 +1,49 @@
+"""
+Ambiente do Alembic - usa os mesmos models e URL da aplicação
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from src.external.database.models import Base, DatabaseConfig
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Gera o SQL das migrações sem conectar no banco"""
+    context.configure(
+        url=DatabaseConfig.get_database_url('pymysql'),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Aplica as migrações conectando no banco"""
+    connectable = create_engine(DatabaseConfig.get_database_url('pymysql'), poolclass=pool.NullPool)
+
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
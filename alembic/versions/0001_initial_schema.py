@@ -0,0 +1,48 @@
+"""initial schema: vehicles e sales
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "vehicles",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("brand", sa.String(50), nullable=False),
+        sa.Column("model", sa.String(100), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("price", sa.DECIMAL(10, 2), nullable=False),
+        sa.Column("color", sa.String(30), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_table(
+        "sales",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("vehicle_id", sa.Integer(), sa.ForeignKey("vehicles.id"), nullable=False, unique=True),
+        sa.Column("customer_cpf", sa.String(14), nullable=False),
+        sa.Column("sale_date", sa.DateTime(), nullable=False),
+        sa.Column("amount", sa.DECIMAL(10, 2), nullable=False),
+        sa.Column("payment_status", sa.String(20), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("sales")
+    op.drop_table("vehicles")
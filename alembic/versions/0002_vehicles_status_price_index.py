@@ -0,0 +1,24 @@
+"""index vehicles(status, price) para as listagens por status
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_vehicles_status_price", "vehicles", ["status", "price"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vehicles_status_price", table_name="vehicles")
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -12,9 +13,31 @@ class Settings(BaseSettings):
     db_user: str = "fiap"
     db_password: str = "fiap"
 
+    # Pool de conexões (por worker). O max_connections do MySQL deve ser
+    # >= (db_pool_size + db_max_overflow) * número de workers do uvicorn.
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 3600
+    # Com ProxySQL como sidecar (127.0.0.1:6033) o proxy mantém o pool real
+    # de conexões com o MySQL e a aplicação não faz pooling próprio.
+    db_use_proxy: bool = False
+
+    # Origens permitidas no CORS, separadas por vírgula. Vazio desliga o middleware
+    # (serviço interno, sem chamadas de navegador).
+    cors_origins: str = "http://localhost:3000"
+
+    @property
+    def cors_origin_list(self) -> list[str]:
+        return [o.strip() for o in self.cors_origins.split(",") if o.strip()]
+
     class Config:
         env_prefix = ""
         env_file = ".env"
         case_sensitive = False
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings()
+
+settings = get_settings()
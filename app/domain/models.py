@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, DateTime, Float, Enum as SAEnum, ForeignKey
+from sqlalchemy import String, Integer, DateTime, Float, Enum as SAEnum, ForeignKey, Index, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from datetime import datetime
 from enum import Enum
@@ -12,6 +12,8 @@ class VehicleStatus(str, Enum):
 
 class Vehicle(Base):
     __tablename__ = "vehicles"
+    # Atende WHERE status = ? ORDER BY price sem filesort
+    __table_args__ = (Index("ix_vehicles_status_price", "status", "price"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     brand: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -20,8 +22,10 @@ class Vehicle(Base):
     color: Mapped[str] = mapped_column(String(50), nullable=False)
     price: Mapped[float] = mapped_column(Float, nullable=False)
     status: Mapped[VehicleStatus] = mapped_column(SAEnum(VehicleStatus), default=VehicleStatus.AVAILABLE, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # Defaults calculados no cliente ficam disponíveis no objeto após o flush,
+    # dispensando o refresh() (SELECT extra) depois do INSERT/UPDATE.
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=datetime.utcnow, nullable=False)
 
     sale: Mapped["Sale"] = relationship("Sale", back_populates="vehicle", uselist=False)
 
@@ -32,14 +36,13 @@ class PaymentStatus(str, Enum):
 
 class Sale(Base):
     __tablename__ = "sales"
-
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     vehicle_id: Mapped[int] = mapped_column(ForeignKey("vehicles.id"), nullable=False, unique=True)
     buyer_cpf: Mapped[str] = mapped_column(String(14), nullable=False)
     sale_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     sale_price: Mapped[float] = mapped_column(Float, nullable=False)
-    payment_code: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    payment_code: Mapped[str | None] = mapped_column(String(64), nullable=True, unique=True)  # índice único: lookup do webhook
     payment_status: Mapped[PaymentStatus] = mapped_column(SAEnum(PaymentStatus), default=PaymentStatus.PENDING, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, server_default=func.now(), nullable=False)
 
     vehicle: Mapped[Vehicle] = relationship("Vehicle", back_populates="sale")
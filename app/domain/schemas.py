@@ -1,50 +1,89 @@
-from enum import Enum
-from datetime import datetime
-from pydantic import BaseModel, Field, field_validator
-
-class VehicleStatus(str, Enum):
-    AVAILABLE = "AVAILABLE"
-    SOLD = "SOLD"
-
-class VehicleCreate(BaseModel):
-    brand: str
-    model: str
-    year: int = Field(ge=1900, le=datetime.now().year + 1)
-    color: str
-    price: float = Field(gt=0)
-
-class VehicleUpdate(BaseModel):
-    brand: str | None = None
-    model: str | None = None
-    year: int | None = Field(default=None, ge=1900, le=datetime.now().year + 1)
-    color: str | None = None
-    price: float | None = Field(default=None, gt=0)
-
-class VehicleOut(BaseModel):
-    id: int
-    brand: str
-    model: str
-    year: int
-    color: str
-    price: float
-    status: VehicleStatus
-    createdAt: datetime
-    updatedAt: datetime
-
-class SellRequest(BaseModel):
-    buyerCpf: str
-    saleDate: datetime
-    salePrice: float = Field(gt=0)
-    paymentCode: str | None = None
-
-    @field_validator("buyerCpf")
-    @classmethod
-    def validate_cpf(cls, v: str) -> str:
-        digits = [c for c in v if c.isdigit()]
-        if len(digits) != 11:
-            raise ValueError("CPF inválido")
-        return v
-
-class PaymentWebhook(BaseModel):
-    paymentCode: str
-    status: str
+import re
+from enum import Enum
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic.alias_generators import to_camel
+
+_NON_DIGITS_RE = re.compile(r"\D")
+
+class VehicleStatus(str, Enum):
+    AVAILABLE = "AVAILABLE"
+    SOLD = "SOLD"
+
+class CamelModel(BaseModel):
+    # Campos em snake_case no Python, camelCase no JSON (entrada e saída)
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True, from_attributes=True)
+
+def _check_max_year(v: int | None) -> int | None:
+    # Limite superior avaliado na validação (não no import), para não congelar o ano
+    if v is not None and v > datetime.now().year + 1:
+        raise ValueError(f"Ano não pode ser maior que {datetime.now().year + 1}")
+    return v
+
+class VehicleCreate(CamelModel):
+    brand: str
+    model: str
+    year: int = Field(ge=1900)
+    color: str
+    price: float = Field(gt=0)
+
+    @field_validator("year")
+    @classmethod
+    def validate_year(cls, v: int) -> int:
+        return _check_max_year(v)
+
+class VehicleUpdate(CamelModel):
+    brand: str | None = None
+    model: str | None = None
+    year: int | None = Field(default=None, ge=1900)
+    color: str | None = None
+    price: float | None = Field(default=None, gt=0)
+
+    @field_validator("year")
+    @classmethod
+    def validate_year(cls, v: int | None) -> int | None:
+        return _check_max_year(v)
+
+class VehicleOut(CamelModel):
+    id: int
+    brand: str
+    model: str
+    year: int
+    color: str
+    price: float
+    status: VehicleStatus
+    created_at: datetime
+    updated_at: datetime
+
+class SellRequest(CamelModel):
+    buyer_cpf: str
+    sale_date: datetime
+    sale_price: float = Field(gt=0)
+    payment_code: str | None = None
+
+    @field_validator("buyer_cpf")
+    @classmethod
+    def validate_cpf(cls, v: str) -> str:
+        if len(_NON_DIGITS_RE.sub("", v)) != 11:
+            raise ValueError("CPF inválido")
+        return v
+
+class PaymentWebhook(CamelModel):
+    payment_code: str
+    status: str
+
+# Payload válido de cada schema: o warmup passa pelo caminho de sucesso dos validadores
+_WARMUP_PAYLOADS = (
+    (VehicleCreate, {"brand": "Fiat", "model": "Uno", "year": 2020, "color": "Branco", "price": 1.0}),
+    (VehicleUpdate, {"price": 1.0}),
+    (VehicleOut, {"id": 1, "brand": "Fiat", "model": "Uno", "year": 2020, "color": "Branco", "price": 1.0,
+                  "status": "AVAILABLE", "createdAt": "2024-01-01T00:00:00", "updatedAt": "2024-01-01T00:00:00"}),
+    (SellRequest, {"buyerCpf": "529.982.247-25", "saleDate": "2024-01-01T00:00:00", "salePrice": 1.0}),
+    (PaymentWebhook, {"paymentCode": "warmup", "status": "PAID"}),
+)
+
+def warmup() -> None:
+    # Monta validadores/serializadores e os exercita antes do primeiro request (chamado no lifespan)
+    for schema, payload in _WARMUP_PAYLOADS:
+        schema.model_rebuild(force=True)
+        schema.model_validate(payload).model_dump(mode="json", by_alias=True)
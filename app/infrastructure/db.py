@@ -1,10 +1,11 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from typing import AsyncIterator
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.engine import URL
+from sqlalchemy.pool import NullPool
 from app.config import settings
 
 DATABASE_URL = URL.create(
-    drivername="mysql+pymysql",
+    drivername="mysql+aiomysql",
     username=settings.db_user,
     password=settings.db_password,
     host=settings.db_host,
@@ -12,5 +13,22 @@ DATABASE_URL = URL.create(
     database=settings.db_name,
 )
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True, pool_size=5, max_overflow=10)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+if settings.db_use_proxy:
+    # ProxySQL multiplexa as conexões: cada sessão abre um socket local barato
+    engine = create_async_engine(DATABASE_URL, poolclass=NullPool)
+else:
+    engine = create_async_engine(
+        DATABASE_URL,
+        pool_pre_ping=True,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+    )
+SessionLocal = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """Sessão por requisição, injetada nas rotas via Depends."""
+    async with SessionLocal() as db:
+        yield db
@@ -1,5 +1,13 @@
+import asyncio
 from app.infrastructure.db import engine
 from app.domain.models import Base
 
+
+async def init_db() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+
 if __name__ == "__main__":
-    Base.metadata.create_all(bind=engine)
+    asyncio.run(init_db())
@@ -1,20 +1,37 @@
-from fastapi import FastAPI
-from app.config import settings
-from app.routers.vehicles import router as vehicles_router
-from app.routers.payments import router as payments_router
-from app.infrastructure.db import engine
-from app.domain.models import Base
-
-app = FastAPI(title=settings.app_name)
-
-@app.get("/health")
-async def health():
-    return {"status": "ok"}
-
-app.include_router(vehicles_router, prefix="/vehicles", tags=["vehicles"])
-app.include_router(payments_router, prefix="/payments", tags=["payments"])
-
-@app.on_event("startup")
-def on_startup():
-    # Em produção, prefira Alembic. Para simplicidade, criamos o schema se não existir.
-    Base.metadata.create_all(bind=engine)
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from app.config import settings
+from app.routers.vehicles import router as vehicles_router
+from app.routers.payments import router as payments_router
+from app.infrastructure.db import engine
+from app.domain.models import Base
+from app.domain.schemas import warmup
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Fora do ambiente local o schema é gerenciado pelo Alembic (scripts/migrate.sh).
+    if settings.app_env == "local":
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    warmup()
+    yield
+    await engine.dispose()
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
+
+if settings.cors_origin_list:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origin_list,
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT"],
+        allow_headers=["Content-Type", "Authorization"],
+    )
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+app.include_router(vehicles_router, prefix="/vehicles", tags=["vehicles"])
+app.include_router(payments_router, prefix="/payments", tags=["payments"])
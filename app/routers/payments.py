@@ -1,20 +1,28 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.domain.schemas import PaymentWebhook
-from app.infrastructure.db import SessionLocal
+from app.infrastructure.db import get_db
 from app.domain.models import Sale, PaymentStatus
 
 router = APIRouter()
 
 @router.post("/webhook")
-def payment_webhook(payload: PaymentWebhook):
-    # Idempotência simples: atualizar se existir e status mudou
-    with SessionLocal() as db:
-        sale = db.query(Sale).filter(Sale.payment_code == payload.paymentCode).first()
-        if not sale:
-            return {"status": "ignored"}
-        desired = PaymentStatus.PAID if payload.status.upper() == "PAID" else PaymentStatus.CANCELED
-        if sale.payment_status != desired:
-            sale.payment_status = desired
-            db.add(sale)
-            db.commit()
-        return {"status": sale.payment_status}
+async def payment_webhook(payload: PaymentWebhook, db: AsyncSession = Depends(get_db)):
+    # Idempotência: o UPDATE só escreve quando o status realmente muda
+    desired = PaymentStatus.PAID if payload.status.upper() == "PAID" else PaymentStatus.CANCELED
+    result = await db.execute(
+        update(Sale)
+        .where(Sale.payment_code == payload.payment_code, Sale.payment_status != desired)
+        .values(payment_status=desired)
+    )
+    await db.commit()
+    if result.rowcount:
+        return {"status": desired}
+    # Nada alterado: venda inexistente ou já no status desejado
+    current = (
+        await db.execute(select(Sale.payment_status).where(Sale.payment_code == payload.payment_code))
+    ).scalar_one_or_none()
+    if current is None:
+        return {"status": "ignored"}
+    return {"status": current}
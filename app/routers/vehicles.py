@@ -1,92 +1,142 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
-from app.infrastructure.db import SessionLocal
-from app.domain.models import Vehicle, Sale, VehicleStatus
-from app.domain.schemas import VehicleCreate, VehicleUpdate, VehicleOut, SellRequest
-
-router = APIRouter()
-
-@router.post("/", response_model=VehicleOut, status_code=201)
-def create_vehicle(payload: VehicleCreate):
-    with SessionLocal() as db:
-        v = Vehicle(
-            brand=payload.brand,
-            model=payload.model,
-            year=payload.year,
-            color=payload.color,
-            price=payload.price,
-        )
-        db.add(v)
-        db.commit()
-        db.refresh(v)
-        return _to_vehicle_out(v)
-
-@router.put("/{vehicle_id}", response_model=VehicleOut)
-def update_vehicle(vehicle_id: int, payload: VehicleUpdate):
-    with SessionLocal() as db:
-        v = db.get(Vehicle, vehicle_id)
-        if not v:
-            raise HTTPException(status_code=404, detail="Vehicle not found")
-        if v.status != VehicleStatus.AVAILABLE:
-            raise HTTPException(status_code=400, detail="Cannot edit a sold vehicle")
-        for field, value in payload.model_dump(exclude_unset=True).items():
-            setattr(v, field, value)
-        db.add(v)
-        db.commit()
-        db.refresh(v)
-        return _to_vehicle_out(v)
-
-@router.get("/", response_model=List[VehicleOut])
-def list_vehicles(
-    status: VehicleStatus = Query(..., description="AVAILABLE or SOLD"),
-    page: int = 1,
-    size: int = 50,
-):
-    with SessionLocal() as db:
-        offset = (page - 1) * size
-        stmt = (
-            select(Vehicle)
-            .where(Vehicle.status == status)
-            .order_by(Vehicle.price.asc())
-            .offset(offset)
-            .limit(size)
-        )
-        rows = db.execute(stmt).scalars().all()
-        return [_to_vehicle_out(v) for v in rows]
-
-@router.post("/{vehicle_id}/sell")
-def sell_vehicle(vehicle_id: int, payload: SellRequest):
-    with SessionLocal() as db:
-        v = db.get(Vehicle, vehicle_id)
-        if not v:
-            raise HTTPException(status_code=404, detail="Vehicle not found")
-        if v.status != VehicleStatus.AVAILABLE:
-            raise HTTPException(status_code=400, detail="Vehicle already sold")
-        v.status = VehicleStatus.SOLD
-        sale = Sale(
-            vehicle_id=v.id,
-            buyer_cpf=payload.buyerCpf,
-            sale_date=payload.saleDate,
-            sale_price=payload.salePrice,
-            payment_code=payload.paymentCode,
-        )
-        db.add_all([v, sale])
-        db.commit()
-        return {"saleId": sale.id, "vehicleId": v.id}
-
-# helpers
-
-def _to_vehicle_out(v: Vehicle) -> VehicleOut:
-    return VehicleOut(
-        id=v.id,
-        brand=v.brand,
-        model=v.model,
-        year=v.year,
-        color=v.color,
-        price=v.price,
-        status=v.status,
-        createdAt=v.created_at,
-        updatedAt=v.updated_at,
-    )
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List
+from pydantic.alias_generators import to_camel
+from sqlalchemy import select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.db import SessionLocal, get_db
+from app.domain.models import Vehicle, Sale, VehicleStatus
+from app.domain.schemas import VehicleCreate, VehicleUpdate, VehicleOut, SellRequest
+
+router = APIRouter()
+
+# Projeção usada nas listagens: só as colunas do VehicleOut, sem hidratar entidades ORM
+_VEHICLE_OUT_COLUMNS = (
+    Vehicle.id,
+    Vehicle.brand,
+    Vehicle.model,
+    Vehicle.year,
+    Vehicle.color,
+    Vehicle.price,
+    Vehicle.status,
+    Vehicle.created_at,
+    Vehicle.updated_at,
+)
+# Chaves JSON (camelCase, como no VehicleOut) na mesma ordem das colunas
+_VEHICLE_OUT_KEYS = tuple(to_camel(c.key) for c in _VEHICLE_OUT_COLUMNS)
+
+# Páginas acima deste tamanho são transmitidas em streaming, em lotes de _STREAM_BATCH_SIZE
+_STREAM_MIN_SIZE = 500
+_STREAM_BATCH_SIZE = 200
+# Teto do size: páginas maiores que isso pedem mais de uma requisição
+_MAX_PAGE_SIZE = 5000
+
+async def _stream_vehicle_rows(stmt) -> AsyncIterator[bytes]:
+    # Sessão própria: a do Depends(get_db) não acompanha a vida do StreamingResponse
+    async with SessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=_STREAM_BATCH_SIZE))
+        yield b"["
+        first = True
+        async for batch in result.partitions():
+            chunk = b",".join(orjson.dumps(dict(zip(_VEHICLE_OUT_KEYS, row))) for row in batch)
+            yield chunk if first else b"," + chunk
+            first = False
+        yield b"]"
+
+@router.post("/", response_model=VehicleOut, status_code=201)
+async def create_vehicle(payload: VehicleCreate, db: AsyncSession = Depends(get_db)):
+    v = Vehicle(
+        brand=payload.brand,
+        model=payload.model,
+        year=payload.year,
+        color=payload.color,
+        price=payload.price,
+    )
+    db.add(v)
+    await db.commit()
+    return v
+
+@router.put("/{vehicle_id}", response_model=VehicleOut)
+async def update_vehicle(vehicle_id: int, payload: VehicleUpdate, db: AsyncSession = Depends(get_db)):
+    v = await db.get(Vehicle, vehicle_id)
+    if not v:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+    if v.status != VehicleStatus.AVAILABLE:
+        raise HTTPException(status_code=400, detail="Cannot edit a sold vehicle")
+    for field, value in payload.model_dump(exclude_unset=True).items():
+        setattr(v, field, value)
+    db.add(v)
+    await db.commit()
+    return v
+
+@router.get("/", response_model=List[VehicleOut])
+async def list_vehicles(
+    response: Response,
+    status: VehicleStatus = Query(..., description="AVAILABLE or SOLD"),
+    after_price: float | None = Query(None, description="Cursor: price of the last vehicle of the previous page (also taken from the last row when the page is streamed)"),
+    after_id: int | None = Query(None, description="Cursor: id of the last vehicle of the previous page"),
+    page: int | None = Query(None, ge=1, description="Legacy OFFSET pagination; prefer the after_price/after_id cursor"),
+    size: int = Query(50, ge=1, le=_MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db),
+):
+    if (after_price is None) != (after_id is None):
+        raise HTTPException(status_code=400, detail="after_price and after_id must be provided together")
+    stmt = (
+        select(*_VEHICLE_OUT_COLUMNS)
+        .where(Vehicle.status == status)
+        .order_by(Vehicle.price.asc(), Vehicle.id.asc())
+    )
+    offset = 0
+    if after_price is not None:
+        # Keyset: custo O(size) independente da profundidade da página
+        stmt = stmt.where(tuple_(Vehicle.price, Vehicle.id) > (after_price, after_id))
+    elif page is not None:
+        offset = (page - 1) * size
+    if size > _STREAM_MIN_SIZE:
+        # Páginas grandes: memória constante, e o size já é limitado por _MAX_PAGE_SIZE.
+        # Os headers saem antes das linhas, então aqui não há X-Next-After-*: o cursor
+        # da próxima página é (price, id) do último elemento do array, lido no mesmo snapshot.
+        return StreamingResponse(
+            _stream_vehicle_rows(stmt.offset(offset).limit(size)),
+            media_type="application/json",
+        )
+    stmt = stmt.limit(size)
+    if offset:
+        stmt = stmt.offset(offset)
+    rows = (await db.execute(stmt)).all()
+    if rows and len(rows) == size:
+        last = rows[-1]
+        response.headers["X-Next-After-Price"] = repr(last.price)
+        response.headers["X-Next-After-Id"] = str(last.id)
+    return rows
+
+@router.post("/{vehicle_id}/sell")
+async def sell_vehicle(vehicle_id: int, payload: SellRequest, db: AsyncSession = Depends(get_db)):
+    # UPDATE condicional: atômico e sem janela para venda dupla
+    result = await db.execute(
+        update(Vehicle)
+        .where(Vehicle.id == vehicle_id, Vehicle.status == VehicleStatus.AVAILABLE)
+        .values(status=VehicleStatus.SOLD)
+    )
+    if result.rowcount == 0:
+        current = await db.scalar(select(Vehicle.status).where(Vehicle.id == vehicle_id))
+        if current is None:
+            raise HTTPException(status_code=404, detail="Vehicle not found")
+        raise HTTPException(status_code=400, detail="Vehicle already sold")
+    sale = Sale(
+        vehicle_id=vehicle_id,
+        buyer_cpf=payload.buyer_cpf,
+        sale_date=payload.sale_date,
+        sale_price=payload.sale_price,
+        payment_code=payload.payment_code,
+    )
+    db.add(sale)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # payment_code é único; o rollback também desfaz a marcação de vendido
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Payment code already in use")
+    return {"saleId": sale.id, "vehicleId": vehicle_id}
@@ -5,6 +5,7 @@ Ponto de entrada que conecta todas as camadas
 import os
 import uvicorn
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
@@ -12,14 +13,17 @@ from dotenv import load_dotenv
 # Carrega variáveis de ambiente do .env
 load_dotenv()
 
+from src.controllers.errors import DomainError
 from src.external.database.models import DatabaseConfig
+from src.external.web.error_handlers import domain_error_handler
 from src.external.web.vehicle_routes import router as vehicle_router
 from src.external.web.sale_routes import router as sale_router
 
 
+@lru_cache(maxsize=1)
 def create_app() -> FastAPI:
     """
-    Factory da aplicação FastAPI
+    Factory da aplicação FastAPI (memoizada: importações repetidas reutilizam a mesma instância)
     
     Responsabilidades da camada externa:
     - Configurar FastAPI (framework)
@@ -34,9 +38,10 @@ def create_app() -> FastAPI:
         """Gerencia o ciclo de vida da aplicação"""
         # Startup
         try:
-            engine = DatabaseConfig.create_engine()
-            DatabaseConfig.create_tables(engine)
-            print("✅ Banco de dados inicializado com sucesso")
+            # Fora do ambiente local o schema é gerenciado pelo Alembic (scripts/migrate.sh)
+            if os.getenv("APP_ENV", "local") == "local":
+                await DatabaseConfig.create_tables(DatabaseConfig.get_engine())
+                print("✅ Banco de dados inicializado com sucesso")
             print("🏗️  Clean Architecture implementada")
             print("📋 Camadas: Entity -> UseCase -> Controller -> Gateway -> Repository")
         except Exception as e:
@@ -44,7 +49,8 @@ def create_app() -> FastAPI:
         
         yield
         
-        # Shutdown
+        # Shutdown: fecha as conexões do pool compartilhado
+        await DatabaseConfig.get_engine().dispose()
         print("🔻 Aplicação finalizada")
     
     # Criar aplicação com lifespan
@@ -70,19 +76,28 @@ def create_app() -> FastAPI:
         lifespan=lifespan
     )
     
-    # Configurar CORS
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=["*"],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
+    # Configurar CORS (lista explícita; CORS_ORIGINS vazio desliga o middleware)
+    cors_origins = [
+        origin.strip()
+        for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
+        if origin.strip()
+    ]
+    if cors_origins:
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=cors_origins,
+            allow_credentials=True,
+            allow_methods=["GET", "POST", "PUT", "DELETE"],
+            allow_headers=["Content-Type", "Authorization"],
+        )
     
     # Registrar routers (camada externa)
     app.include_router(vehicle_router)
     app.include_router(sale_router)
     
+    # Erros de domínio dos Controllers -> respostas HTTP (um handler para todos os endpoints)
+    app.add_exception_handler(DomainError, domain_error_handler)
+    
     # Health check endpoint
     @app.get("/health")
     async def health_check():
@@ -94,58 +109,6 @@ def create_app() -> FastAPI:
             "architecture": "Clean Architecture with SOLID principles"
         }
     
-    # Endpoint de teste para debug
-    @app.get("/debug/database")
-    async def test_database():
-        """Endpoint para testar conexão com banco"""
-        try:
-            engine = DatabaseConfig.create_engine()
-            SessionLocal = DatabaseConfig.get_session_factory(engine)
-            session = SessionLocal()
-            
-            # Teste simples de query
-            from src.external.database.vehicle_repository import SQLAlchemyVehicleRepository
-            repo = SQLAlchemyVehicleRepository(session)
-            vehicles = repo.find_all()
-            
-            session.close()
-            
-            return {
-                "status": "success",
-                "message": "Conexão com banco funcionando",
-                "total_vehicles": len(vehicles),
-                "vehicles": vehicles
-            }
-        except Exception as e:
-            return {
-                "status": "error",
-                "message": f"Erro ao conectar com banco: {str(e)}",
-                "error_type": str(type(e))
-            }
-    
-    # Endpoint para recriar tabelas
-    @app.post("/debug/recreate-tables")
-    async def recreate_tables():
-        """Endpoint para recriar tabelas do banco"""
-        try:
-            engine = DatabaseConfig.create_engine()
-            from src.external.database.models import Base
-            
-            # Drop e recria todas as tabelas
-            Base.metadata.drop_all(engine)
-            Base.metadata.create_all(engine)
-            
-            return {
-                "status": "success",
-                "message": "Tabelas recriadas com sucesso"
-            }
-        except Exception as e:
-            return {
-                "status": "error",
-                "message": f"Erro ao recriar tabelas: {str(e)}",
-                "error_type": str(type(e))
-            }
-    
     return app
 
 
@@ -157,17 +120,24 @@ if __name__ == "__main__":
     # Configurações do servidor
     host = os.getenv("API_HOST", "0.0.0.0")
     port = int(os.getenv("API_PORT", 8000))
+    is_local = os.getenv("APP_ENV", "local") == "local"
     
     print("🚀 Iniciando FIAP Vehicles API - Clean Architecture")
     print(f"📡 Servidor rodando em: http://{host}:{port}")
     print(f"📖 Documentação: http://{host}:{port}/docs")
     print("🏗️  Arquitetura: Clean Architecture + SOLID")
     
-    # Executa o servidor
-    uvicorn.run(
-        "main:app",
-        host=host,
-        port=port,
-        reload=True,
-        log_level="info"
-    )
+    # Executa o servidor: uvloop + httptools (uvicorn[standard]); reload e access log só no ambiente local
+    if is_local:
+        uvicorn.run("main:app", host=host, port=port, reload=True, log_level="info")
+    else:
+        uvicorn.run(
+            "main:app",
+            host=host,
+            port=port,
+            workers=int(os.getenv("API_WORKERS", os.cpu_count() or 1)),
+            loop="uvloop",
+            http="httptools",
+            log_level=os.getenv("LOG_LEVEL", "warning").lower(),
+            access_log=False
+        )
@@ -0,0 +1,8 @@
+#!/bin/sh
+# Aplica as migrações pendentes do banco (Alembic)
+# Uso: scripts/migrate.sh [revisão]   (padrão: head)
+
+set -e
+
+cd "$(dirname "$0")/.."
+alembic upgrade "${1:-head}"
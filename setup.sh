@@ -67,6 +67,7 @@ if command -v k3s &> /dev/null; then
     kubectl apply -f k8s/namespace.yaml
     kubectl apply -f k8s/mysql-secret.yaml
     kubectl apply -f k8s/mysql-statefulset.yaml
+    kubectl apply -f k8s/proxysql.yaml
     kubectl apply -f k8s/api.yaml
     kubectl apply -f k8s/api-nodeport.yaml
     kubectl apply -f k8s/ingress.yaml
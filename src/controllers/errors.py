@@ -0,0 +1,29 @@
+"""
+Erros de domínio dos Controllers
+Levam o corpo de erro já formatado pelo Presenter; a camada web traduz cada tipo para o status HTTP
+"""
+from typing import Dict, Any
+
+
+class DomainError(Exception):
+    """
+    Erro de domínio levantado pelo Controller
+    
+    detail: resposta de erro montada pelo Presenter (error, error_code, message, ...)
+    """
+    
+    def __init__(self, detail: Dict[str, Any]):
+        super().__init__(detail.get('message'))
+        self.detail = detail
+
+
+class ValidationError(DomainError):
+    """Dados inválidos ou regra de negócio violada"""
+
+
+class NotFoundError(DomainError):
+    """Recurso não encontrado"""
+
+
+class InternalError(DomainError):
+    """Falha inesperada durante a orquestração"""
@@ -18,6 +18,33 @@ from ..use_cases.sale_use_cases import (
 from ..presenters.sale_presenter import SalePresenter
 
 
+# Use Case responsável por cada ação do controller (recebe os Gateways de vendas e veículos)
+_USE_CASES = {
+    'create': lambda sales, vehicles: CreateSaleUseCase(sales, vehicles),
+    'find_by_id': lambda sales, vehicles: FindSaleByIdUseCase(sales),
+    'find_by_vehicle': lambda sales, vehicles: FindSaleByVehicleIdUseCase(sales),
+    'list_all': lambda sales, vehicles: ListAllSalesUseCase(sales),
+    'update_payment': lambda sales, vehicles: UpdatePaymentStatusUseCase(sales),
+    'webhook': lambda sales, vehicles: ProcessPaymentWebhookUseCase(sales),
+}
+
+
+class _UseCaseTable(dict):
+    """
+    Use Cases com os Gateways injetados, criados sob demanda: o controller vive
+    uma requisição e cada requisição usa apenas um ou dois deles
+    """
+    
+    def __init__(self, sale_gateway: SaleGateway, vehicle_gateway: VehicleGateway):
+        super().__init__()
+        self._sale_gateway = sale_gateway
+        self._vehicle_gateway = vehicle_gateway
+    
+    def __missing__(self, action: str):
+        use_case = self[action] = _USE_CASES[action](self._sale_gateway, self._vehicle_gateway)
+        return use_case
+
+
 class SaleController:
     """
     Controller de Vendas - Clean Architecture
@@ -36,21 +63,16 @@ class SaleController:
         self._sale_gateway = SaleGateway(sale_repository)
         self._vehicle_gateway = VehicleGateway(vehicle_repository)
         
-        # Injeta Gateways nos Use Cases
-        self._create_use_case = CreateSaleUseCase(self._sale_gateway, self._vehicle_gateway)
-        self._find_by_id_use_case = FindSaleByIdUseCase(self._sale_gateway)
-        self._find_by_vehicle_use_case = FindSaleByVehicleIdUseCase(self._sale_gateway)
-        self._list_all_use_case = ListAllSalesUseCase(self._sale_gateway)
-        self._update_payment_use_case = UpdatePaymentStatusUseCase(self._sale_gateway)
-        self._webhook_use_case = ProcessPaymentWebhookUseCase(self._sale_gateway)
+        # Tabela de Use Cases indexada por ação
+        self._uc = _UseCaseTable(self._sale_gateway, self._vehicle_gateway)
     
-    def create_sale(self, vehicle_id: int, customer_cpf: str, amount: Decimal) -> Dict[str, Any]:
+    async def create_sale(self, vehicle_id: int, customer_cpf: str, amount: Decimal) -> Dict[str, Any]:
         """
         Orquestra criação de venda: UseCase -> Presenter
         """
         try:
             # Executa Use Case
-            sale = self._create_use_case.execute(
+            sale = await self._uc['create'].execute(
                 vehicle_id=vehicle_id,
                 customer_cpf=customer_cpf,
                 amount=amount
@@ -64,13 +86,13 @@ class SaleController:
         except Exception as e:
             return SalePresenter.to_error_response(str(e), 'INTERNAL_ERROR')
     
-    def find_sale_by_id(self, sale_id: int) -> Dict[str, Any]:
+    async def find_sale_by_id(self, sale_id: int) -> Dict[str, Any]:
         """
         Orquestra busca por ID: UseCase -> Presenter
         """
         try:
             # Executa Use Case
-            sale = self._find_by_id_use_case.execute(sale_id)
+            sale = await self._uc['find_by_id'].execute(sale_id)
             
             if not sale:
                 return SalePresenter.to_not_found_response(sale_id)
@@ -86,13 +108,13 @@ class SaleController:
         except Exception as e:
             return SalePresenter.to_error_response(str(e), 'INTERNAL_ERROR')
     
-    def find_sale_by_vehicle_id(self, vehicle_id: int) -> Dict[str, Any]:
+    async def find_sale_by_vehicle_id(self, vehicle_id: int) -> Dict[str, Any]:
         """
         Orquestra busca por ID do veículo: UseCase -> Presenter
         """
         try:
             # Executa Use Case
-            sale = self._find_by_vehicle_use_case.execute(vehicle_id)
+            sale = await self._uc['find_by_vehicle'].execute(vehicle_id)
             
             if not sale:
                 return {
@@ -114,31 +136,33 @@ class SaleController:
         except Exception as e:
             return SalePresenter.to_error_response(str(e), 'INTERNAL_ERROR')
     
-    def list_all_sales(self) -> Dict[str, Any]:
+    async def list_all_sales(self, limit: int = 100, offset: int = 0) -> Dict[str, Any]:
         """
-        Orquestra listagem de todas as vendas: UseCase -> Presenter
+        Orquestra listagem paginada de todas as vendas: UseCase -> Presenter
         """
         try:
-            # Executa Use Case
-            sales = self._list_all_use_case.execute()
+            # Executa Use Case (uma única consulta LIMIT/OFFSET)
+            sales = await self._uc['list_all'].execute(limit=limit, offset=offset)
             
             # Formata resposta via Presenter
             return {
                 'sales': SalePresenter.to_public_list(sales),  # CPF mascarado
                 'total': len(sales),
+                'limit': limit,
+                'offset': offset,
                 'status': 'success'
             }
             
         except Exception as e:
             return SalePresenter.to_error_response(str(e), 'INTERNAL_ERROR')
     
-    def update_payment_status(self, sale_id: int, payment_status: str) -> Dict[str, Any]:
+    async def update_payment_status(self, sale_id: int, payment_status: str) -> Dict[str, Any]:
         """
         Orquestra atualização de status de pagamento: UseCase -> Presenter
         """
         try:
             # Executa Use Case
-            sale = self._update_payment_use_case.execute(
+            sale = await self._uc['update_payment'].execute(
                 sale_id=sale_id,
                 payment_status=payment_status
             )
@@ -151,13 +175,13 @@ class SaleController:
         except Exception as e:
             return SalePresenter.to_error_response(str(e), 'INTERNAL_ERROR')
     
-    def process_payment_webhook(self, payment_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def process_payment_webhook(self, payment_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Orquestra processamento de webhook: UseCase -> Presenter
         """
         try:
             # Executa Use Case (idempotente)
-            result = self._webhook_use_case.execute(payment_data)
+            result = await self._uc['webhook'].execute(payment_data)
             
             # Formata resposta via Presenter
             return SalePresenter.to_webhook_response(result)
@@ -165,13 +189,13 @@ class SaleController:
         except Exception as e:
             return SalePresenter.to_error_response(str(e), 'WEBHOOK_ERROR')
     
-    def get_payment_status(self, sale_id: int) -> Dict[str, Any]:
+    async def get_payment_status(self, sale_id: int) -> Dict[str, Any]:
         """
         Orquestra consulta de status de pagamento: UseCase -> Presenter
         """
         try:
             # Executa Use Case
-            sale = self._find_by_id_use_case.execute(sale_id)
+            sale = await self._uc['find_by_id'].execute(sale_id)
             
             if not sale:
                 return SalePresenter.to_not_found_response(sale_id)
@@ -4,6 +4,7 @@ Responsável por instanciar e coordenar Gateway, UseCase e Presenter
 """
 from typing import List, Dict, Any, Optional
 from decimal import Decimal
+from functools import wraps
 
 from ..gateways.vehicle_gateway import VehicleGateway, VehicleRepositoryInterface
 from ..use_cases.vehicle_use_cases import (
@@ -17,6 +18,53 @@ from ..use_cases.vehicle_use_cases import (
     MarkVehicleAsSoldUseCase
 )
 from ..presenters.vehicle_presenter import VehiclePresenter
+from .errors import DomainError, ValidationError, NotFoundError, InternalError
+
+
+# Use Case responsável por cada ação do controller
+_USE_CASES = {
+    'create': CreateVehicleUseCase,
+    'find_by_id': FindVehicleByIdUseCase,
+    'list_all': ListAllVehiclesUseCase,
+    'list_available': ListAvailableVehiclesUseCase,
+    'list_sold': ListSoldVehiclesUseCase,
+    'update': UpdateVehicleUseCase,
+    'delete': DeleteVehicleUseCase,
+    'mark_sold': MarkVehicleAsSoldUseCase,
+}
+
+
+class _UseCaseTable(dict):
+    """
+    Use Cases com o Gateway injetado, criados sob demanda: o controller vive
+    uma requisição e cada requisição usa apenas um deles
+    """
+    
+    def __init__(self, gateway: VehicleGateway):
+        super().__init__()
+        self._gateway = gateway
+    
+    def __missing__(self, action: str):
+        use_case = self[action] = _USE_CASES[action](self._gateway)
+        return use_case
+
+
+def _orchestrate(method):
+    """
+    Tratamento de erros comum aos métodos do controller:
+    ValueError -> ValidationError (VALIDATION_ERROR), demais exceções -> InternalError (INTERNAL_ERROR)
+    """
+    @wraps(method)
+    async def wrapper(*args, **kwargs) -> Dict[str, Any]:
+        try:
+            return await method(*args, **kwargs)
+        except DomainError:
+            raise
+        except ValueError as e:
+            raise ValidationError(VehiclePresenter.to_error_response(str(e), 'VALIDATION_ERROR')) from e
+        except Exception as e:
+            raise InternalError(VehiclePresenter.to_error_response(str(e), 'INTERNAL_ERROR')) from e
+    return wrapper
 
 
 class VehicleController:
@@ -29,184 +77,138 @@ class VehicleController:
     - Instanciar Use Cases com Gateway injetado
     - Orquestrar fluxo: UseCase -> Presenter
     - Retornar dados formatados para Controller Web
+    - Levantar DomainError (errors.py) nas falhas; a camada web traduz para HTTP
     """
     
     def __init__(self, repository: VehicleRepositoryInterface):
         # Injeta repositório no Gateway (Inversão de Dependência - SOLID)
         self._gateway = VehicleGateway(repository)
         
-        # Injeta Gateway nos Use Cases
-        self._create_use_case = CreateVehicleUseCase(self._gateway)
-        self._find_by_id_use_case = FindVehicleByIdUseCase(self._gateway)
-        self._list_all_use_case = ListAllVehiclesUseCase(self._gateway)
-        self._list_available_use_case = ListAvailableVehiclesUseCase(self._gateway)
-        self._list_sold_use_case = ListSoldVehiclesUseCase(self._gateway)
-        self._update_use_case = UpdateVehicleUseCase(self._gateway)
-        self._delete_use_case = DeleteVehicleUseCase(self._gateway)
-        self._mark_sold_use_case = MarkVehicleAsSoldUseCase(self._gateway)
+        # Tabela de Use Cases indexada por ação
+        self._uc = _UseCaseTable(self._gateway)
     
-    def create_vehicle(self, brand: str, model: str, year: int, 
+    @_orchestrate
+    async def create_vehicle(self, brand: str, model: str, year: int, 
                       price: Decimal, color: str) -> Dict[str, Any]:
         """
         Orquestra criação de veículo: UseCase -> Presenter
         """
-        try:
-            # Executa Use Case
-            vehicle = self._create_use_case.execute(
-                brand=brand,
-                model=model,
-                year=year,
-                price=price,
-                color=color
-            )
-            
-            # Formata resposta via Presenter
-            return VehiclePresenter.to_create_response(vehicle)
-            
-        except ValueError as e:
-            return VehiclePresenter.to_error_response(str(e), 'VALIDATION_ERROR')
-        except Exception as e:
-            return VehiclePresenter.to_error_response(str(e), 'INTERNAL_ERROR')
+        # Executa Use Case
+        vehicle = await self._uc['create'].execute(
+            brand=brand,
+            model=model,
+            year=year,
+            price=price,
+            color=color
+        )
+        
+        # Formata resposta via Presenter
+        return VehiclePresenter.to_create_response(vehicle)
     
-    def find_vehicle_by_id(self, vehicle_id: int) -> Dict[str, Any]:
+    @_orchestrate
+    async def find_vehicle_by_id(self, vehicle_id: int) -> Dict[str, Any]:
         """
         Orquestra busca por ID: UseCase -> Presenter
         """
-        try:
-            # Executa Use Case
-            vehicle = self._find_by_id_use_case.execute(vehicle_id)
-            
-            if not vehicle:
-                return VehiclePresenter.to_not_found_response(vehicle_id)
-            
-            # Formata resposta via Presenter
-            return {
-                'vehicle': VehiclePresenter.to_dict(vehicle),
-                'status': 'found'
-            }
-            
-        except ValueError as e:
-            return VehiclePresenter.to_error_response(str(e), 'VALIDATION_ERROR')
-        except Exception as e:
-            return VehiclePresenter.to_error_response(str(e), 'INTERNAL_ERROR')
+        # Executa Use Case
+        vehicle = await self._uc['find_by_id'].execute(vehicle_id)
+        
+        if not vehicle:
+            raise NotFoundError(VehiclePresenter.to_not_found_response(vehicle_id))
+        
+        # Formata resposta via Presenter
+        return {
+            'vehicle': VehiclePresenter.to_dict(vehicle),
+            'status': 'found'
+        }
     
-    def list_all_vehicles(self) -> Dict[str, Any]:
+    @_orchestrate
+    async def list_all_vehicles(self, limit: int = 100, offset: int = 0) -> Dict[str, Any]:
         """
-        Orquestra listagem de todos os veículos: UseCase -> Presenter
+        Orquestra listagem paginada de todos os veículos: UseCase -> Presenter
         """
-        try:
-            # Executa Use Case
-            vehicles = self._list_all_use_case.execute()
-            
-            # Formata resposta via Presenter
-            return {
-                'vehicles': VehiclePresenter.to_list(vehicles),
-                'total': len(vehicles),
-                'status': 'success'
-            }
-            
-        except Exception as e:
-            return VehiclePresenter.to_error_response(str(e), 'INTERNAL_ERROR')
+        # Executa Use Case (uma única consulta LIMIT/OFFSET)
+        vehicles = await self._uc['list_all'].execute(limit=limit, offset=offset)
+        
+        # Formata resposta via Presenter (lote em colunas serializado para JSON)
+        return {
+            'body': VehiclePresenter.batch_to_json(vehicles, limit, offset),
+            'content_type': 'application/json'
+        }
     
-    def list_available_vehicles(self) -> Dict[str, Any]:
+    @_orchestrate
+    async def list_available_vehicles(self, limit: int = 100, offset: int = 0) -> Dict[str, Any]:
         """
-        Orquestra listagem de veículos disponíveis: UseCase -> Presenter
+        Orquestra listagem paginada de veículos disponíveis: UseCase -> Presenter
         """
-        try:
-            # Executa Use Case
-            vehicles = self._list_available_use_case.execute()
-            
-            # Formata resposta via Presenter
-            return {
-                'vehicles': VehiclePresenter.to_public_list(vehicles),
-                'total': len(vehicles),
-                'status': 'success',
-                'filter': 'available_only'
-            }
-            
-        except Exception as e:
-            return VehiclePresenter.to_error_response(str(e), 'INTERNAL_ERROR')
+        # Executa Use Case (uma única consulta LIMIT/OFFSET)
+        vehicles = await self._uc['list_available'].execute(limit=limit, offset=offset)
+        
+        # Formata resposta via Presenter (lote em colunas serializado para JSON)
+        return {
+            'body': VehiclePresenter.batch_to_public_json(vehicles, limit, offset, 'available_only'),
+            'content_type': 'application/json'
+        }
     
-    def list_sold_vehicles(self) -> Dict[str, Any]:
+    @_orchestrate
+    async def list_sold_vehicles(self, limit: int = 100, offset: int = 0) -> Dict[str, Any]:
         """
-        Orquestra listagem de veículos vendidos: UseCase -> Presenter
+        Orquestra listagem paginada de veículos vendidos: UseCase -> Presenter
         """
-        try:
-            # Executa Use Case
-            vehicles = self._list_sold_use_case.execute()
-            
-            # Formata resposta via Presenter
-            return {
-                'vehicles': VehiclePresenter.to_public_list(vehicles),
-                'total': len(vehicles),
-                'status': 'success',
-                'filter': 'sold_only'
-            }
-            
-        except Exception as e:
-            return VehiclePresenter.to_error_response(str(e), 'INTERNAL_ERROR')
+        # Executa Use Case (uma única consulta LIMIT/OFFSET)
+        vehicles = await self._uc['list_sold'].execute(limit=limit, offset=offset)
+        
+        # Formata resposta via Presenter (lote em colunas serializado para JSON)
+        return {
+            'body': VehiclePresenter.batch_to_public_json(vehicles, limit, offset, 'sold_only'),
+            'content_type': 'application/json'
+        }
     
-    def update_vehicle(self, vehicle_id: int, brand: str = None, model: str = None,
+    @_orchestrate
+    async def update_vehicle(self, vehicle_id: int, brand: str = None, model: str = None,
                       year: int = None, price: Decimal = None, color: str = None) -> Dict[str, Any]:
         """
         Orquestra atualização de veículo: UseCase -> Presenter
         """
-        try:
-            # Executa Use Case
-            vehicle = self._update_use_case.execute(
-                vehicle_id=vehicle_id,
-                brand=brand,
-                model=model,
-                year=year,
-                price=price,
-                color=color
-            )
-            
-            # Formata resposta via Presenter
-            return VehiclePresenter.to_update_response(vehicle)
-            
-        except ValueError as e:
-            return VehiclePresenter.to_error_response(str(e), 'VALIDATION_ERROR')
-        except Exception as e:
-            return VehiclePresenter.to_error_response(str(e), 'INTERNAL_ERROR')
+        # Executa Use Case
+        vehicle = await self._uc['update'].execute(
+            vehicle_id=vehicle_id,
+            brand=brand,
+            model=model,
+            year=year,
+            price=price,
+            color=color
+        )
+        
+        # Formata resposta via Presenter
+        return VehiclePresenter.to_update_response(vehicle)
     
-    def delete_vehicle(self, vehicle_id: int) -> Dict[str, Any]:
+    @_orchestrate
+    async def delete_vehicle(self, vehicle_id: int) -> Dict[str, Any]:
         """
         Orquestra exclusão de veículo: UseCase -> Presenter
         """
-        try:
-            # Executa Use Case
-            success = self._delete_use_case.execute(vehicle_id)
-            
-            if success:
-                # Formata resposta via Presenter
-                return VehiclePresenter.to_delete_response(vehicle_id)
-            else:
-                return VehiclePresenter.to_error_response(
-                    "Falha ao excluir veículo", 'DELETE_ERROR'
-                )
-            
-        except ValueError as e:
-            return VehiclePresenter.to_error_response(str(e), 'VALIDATION_ERROR')
-        except Exception as e:
-            return VehiclePresenter.to_error_response(str(e), 'INTERNAL_ERROR')
+        # Executa Use Case
+        success = await self._uc['delete'].execute(vehicle_id)
+        
+        if success:
+            # Formata resposta via Presenter
+            return VehiclePresenter.to_delete_response(vehicle_id)
+        raise InternalError(VehiclePresenter.to_error_response(
+            "Falha ao excluir veículo", 'DELETE_ERROR'
+        ))
     
-    def mark_vehicle_as_sold(self, vehicle_id: int) -> Dict[str, Any]:
+    @_orchestrate
+    async def mark_vehicle_as_sold(self, vehicle_id: int) -> Dict[str, Any]:
         """
         Orquestra marcação como vendido: UseCase -> Presenter
         """
-        try:
-            # Executa Use Case
-            vehicle = self._mark_sold_use_case.execute(vehicle_id)
-            
-            # Formata resposta via Presenter
-            return {
-                'message': 'Veículo marcado como vendido',
-                'vehicle': VehiclePresenter.to_dict(vehicle),
-                'status': 'sold'
-            }
-            
-        except ValueError as e:
-            return VehiclePresenter.to_error_response(str(e), 'VALIDATION_ERROR')
-        except Exception as e:
-            return VehiclePresenter.to_error_response(str(e), 'INTERNAL_ERROR')
+        # Executa Use Case
+        vehicle = await self._uc['mark_sold'].execute(vehicle_id)
+        
+        # Formata resposta via Presenter
+        return {
+            'message': 'Veículo marcado como vendido',
+            'vehicle': VehiclePresenter.to_dict(vehicle),
+            'status': 'sold'
+        }
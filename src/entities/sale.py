@@ -2,13 +2,29 @@
 Entidade Sale - Camada mais pura da Clean Architecture
 Contém apenas regras de negócio sem dependências externas
 """
-from datetime import datetime
+from datetime import datetime, timedelta
 from decimal import Decimal
 from enum import Enum
-from typing import Optional
+from typing import Any, Mapping, Optional
 import re
 
 
+# Padrões compilados uma única vez no import do módulo
+_CPF_NON_DIGITS_RE = re.compile(r'[^0-9]')
+
+# Separadores usuais do CPF (123.456.789-09), removidos com str.translate
+_CPF_SEPARATORS = str.maketrans('', '', '.-/ ')
+
+# Pesos dos dígitos verificadores; os offsets descontam o '0' (48) dos bytes ASCII
+_CPF_WEIGHTS_1 = tuple(range(10, 1, -1))
+_CPF_WEIGHTS_2 = tuple(range(11, 1, -1))
+_CPF_OFFSET_1 = ord('0') * sum(_CPF_WEIGHTS_1)
+_CPF_OFFSET_2 = ord('0') * sum(_CPF_WEIGHTS_2)
+
+# Venda com mais de 30 dias completos é rejeitada
+_SALE_MAX_AGE = timedelta(days=31)
+
+
 class PaymentStatus(Enum):
     """Status disponíveis para um pagamento"""
     PENDING = "pending"
@@ -16,6 +32,22 @@ class PaymentStatus(Enum):
     REJECTED = "rejected"
 
 
+# Status -> string sem passar pelo descriptor .value a cada linha serializada
+PAYMENT_STATUS_STR = {status: status.value for status in PaymentStatus}
+
+# string -> Status sem passar por PaymentStatus(...): aceita o valor e o nome
+# (minúsculo/maiúsculo); outras grafias caem no construtor com lower()
+PAYMENT_STATUS_FROM_STR = {
+    **{status.value: status for status in PaymentStatus},
+    **{status.name: status for status in PaymentStatus},
+}
+
+
+def parse_payment_status(value: str) -> 'PaymentStatus':
+    """Converte a string do repositório para PaymentStatus"""
+    return PAYMENT_STATUS_FROM_STR.get(value) or PaymentStatus(value.lower())
+
+
 class Sale:
     """
     Entidade Sale - Representa uma venda no domínio
@@ -26,6 +58,10 @@ class Sale:
     - Lógica de domínio sem dependências externas
     """
     
+    # Atributos fixos: sem __dict__ por instância
+    __slots__ = ('_id', '_vehicle_id', '_customer_cpf', '_sale_date', '_amount_cents',
+                 '_payment_status', '_created_at', '_updated_at')
+    
     def __init__(
         self,
         vehicle_id: int,
@@ -35,16 +71,43 @@ class Sale:
         sale_id: Optional[int] = None,
         payment_status: PaymentStatus = PaymentStatus.PENDING,
         created_at: Optional[datetime] = None,
-        updated_at: Optional[datetime] = None
+        updated_at: Optional[datetime] = None,
+        _now: Optional[datetime] = None
     ):
+        # Um único relógio por construção (ou por lote, quando _now é informado)
+        now = _now or datetime.now()
         self._id = sale_id
         self._vehicle_id = self._validate_vehicle_id(vehicle_id)
         self._customer_cpf = self._validate_cpf(customer_cpf)
-        self._sale_date = self._validate_sale_date(sale_date)
-        self._amount = self._validate_amount(amount)
+        self._sale_date = self._validate_sale_date(sale_date, now)
+        self._amount_cents = self._validate_amount(amount)
         self._payment_status = payment_status
-        self._created_at = created_at or datetime.now()
-        self._updated_at = updated_at or datetime.now()
+        self._created_at = created_at or now
+        self._updated_at = updated_at or now
+    
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> 'Sale':
+        """
+        Reconstrói uma venda a partir de uma linha do repositório
+        
+        Os dados já foram validados na escrita, então não passam de novo pelas
+        regras de __init__ (dígitos do CPF, janela da data); entradas do usuário
+        continuam usando o construtor.
+        """
+        sale = cls.__new__(cls)
+        sale._id = row['id']
+        sale._vehicle_id = row['vehicle_id']
+        sale._customer_cpf = row['customer_cpf']
+        sale._sale_date = row['sale_date']
+        # Mesmo arredondamento de _validate_amount (o DECIMAL do banco já chega como Decimal)
+        amount = row['amount']
+        if not isinstance(amount, Decimal):
+            amount = Decimal(str(amount))
+        sale._amount_cents = int(amount.scaleb(2).to_integral_value())
+        sale._payment_status = parse_payment_status(row['payment_status'])
+        sale._created_at = row.get('created_at')
+        sale._updated_at = row.get('updated_at')
+        return sale
     
     # Getters (properties)
     @property
@@ -65,7 +128,12 @@ class Sale:
     
     @property
     def amount(self) -> Decimal:
-        return self._amount
+        return Decimal(self._amount_cents).scaleb(-2)
+    
+    @property
+    def amount_float(self) -> float:
+        """Valor como float para saída JSON; mesmo valor de float(amount), sem criar o Decimal"""
+        return self._amount_cents / 100
     
     @property
     def payment_status(self) -> PaymentStatus:
@@ -138,8 +206,9 @@ class Sale:
         if not cpf or not isinstance(cpf, str):
             raise ValueError("CPF é obrigatório e deve ser uma string")
         
-        # Remove caracteres não numéricos
-        cpf = re.sub(r'[^0-9]', '', cpf)
+        # Remove caracteres não numéricos (regex só quando sobra algo além dos separadores)
+        digits = cpf.translate(_CPF_SEPARATORS)
+        cpf = digits if digits.isascii() and digits.isdigit() else _CPF_NON_DIGITS_RE.sub('', cpf)
         
         # Verifica se tem 11 dígitos
         if len(cpf) != 11:
@@ -154,68 +223,79 @@ class Sale:
             raise ValueError("CPF inválido")
         
         # Formata o CPF
-        return f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}"
+        return cpf[:3] + '.' + cpf[3:6] + '.' + cpf[6:9] + '-' + cpf[9:]
     
     def _validate_cpf_algorithm(self, cpf: str) -> bool:
         """Algoritmo de validação do CPF"""
+        # Bytes ASCII dos dígitos; somas desenroladas (o CPF tem tamanho fixo)
+        d = cpf.encode('ascii')
+        
         # Primeiro dígito verificador
-        sum1 = sum(int(cpf[i]) * (10 - i) for i in range(9))
+        sum1 = (d[0] * 10 + d[1] * 9 + d[2] * 8 + d[3] * 7 + d[4] * 6
+                + d[5] * 5 + d[6] * 4 + d[7] * 3 + d[8] * 2) - _CPF_OFFSET_1
         digit1 = 11 - (sum1 % 11)
         if digit1 >= 10:
             digit1 = 0
         
-        if int(cpf[9]) != digit1:
+        if d[9] - 48 != digit1:
             return False
         
         # Segundo dígito verificador
-        sum2 = sum(int(cpf[i]) * (11 - i) for i in range(10))
+        sum2 = (d[0] * 11 + d[1] * 10 + d[2] * 9 + d[3] * 8 + d[4] * 7
+                + d[5] * 6 + d[6] * 5 + d[7] * 4 + d[8] * 3 + d[9] * 2) - _CPF_OFFSET_2
         digit2 = 11 - (sum2 % 11)
         if digit2 >= 10:
             digit2 = 0
         
-        return int(cpf[10]) == digit2
+        return d[10] - 48 == digit2
     
-    def _validate_sale_date(self, sale_date: datetime) -> datetime:
+    def _validate_sale_date(self, sale_date: datetime, now: Optional[datetime] = None) -> datetime:
         """Valida a data da venda"""
         if not isinstance(sale_date, datetime):
             raise ValueError("Data da venda deve ser um datetime")
         
+        now = now or datetime.now()
+        
         # Não pode ser muito no futuro (máximo 1 dia)
-        now = datetime.now()
         if sale_date > now.replace(hour=23, minute=59, second=59):
             raise ValueError("Data da venda não pode ser no futuro")
         
         # Não pode ser muito antiga (máximo 30 dias)
-        days_diff = (now - sale_date).days
-        if days_diff > 30:
+        if sale_date <= now - _SALE_MAX_AGE:
             raise ValueError("Data da venda não pode ser anterior a 30 dias")
         
         return sale_date
     
-    def _validate_amount(self, amount: Decimal) -> Decimal:
-        """Valida o valor da venda"""
+    def _validate_amount(self, amount: Decimal) -> int:
+        """Valida o valor da venda e o devolve em centavos"""
         if not isinstance(amount, (Decimal, int, float)):
             raise ValueError("Valor da venda deve ser um número")
         
-        amount = Decimal(str(amount))
+        # Centavos inteiros: arredonda uma única vez (ROUND_HALF_EVEN, como o quantize)
+        if isinstance(amount, int):
+            cents = amount * 100
+        else:
+            if isinstance(amount, float):
+                amount = Decimal(str(amount))
+            cents = int(amount.scaleb(2).to_integral_value())
         
-        if amount <= 0:
+        if cents <= 0:
             raise ValueError("Valor da venda deve ser maior que zero")
-        if amount > Decimal('9999999.99'):
+        if cents > 999_999_999:
             raise ValueError("Valor da venda deve ser menor que R$ 9.999.999,99")
         
-        return amount.quantize(Decimal('0.01'))  # 2 casas decimais
+        return cents
     
     def get_cpf_numbers_only(self) -> str:
         """Retorna apenas os números do CPF"""
-        return re.sub(r'[^0-9]', '', self._customer_cpf)
+        return _CPF_NON_DIGITS_RE.sub('', self._customer_cpf)
     
     def __str__(self) -> str:
-        return f"Venda {self._id} - Veículo {self._vehicle_id} - {self._customer_cpf} - R$ {self._amount}"
+        return f"Venda {self._id} - Veículo {self._vehicle_id} - {self._customer_cpf} - R$ {self.amount}"
     
     def __repr__(self) -> str:
         return (f"Sale(id={self._id}, vehicle_id={self._vehicle_id}, "
-                f"customer_cpf='{self._customer_cpf}', amount={self._amount}, "
+                f"customer_cpf='{self._customer_cpf}', amount={self.amount}, "
                 f"payment_status={self._payment_status.value})")
     
     def __eq__(self, other) -> bool:
@@ -5,8 +5,7 @@ Contém apenas regras de negócio sem dependências externas
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from typing import Optional
-import re
+from typing import Any, List, Mapping, Optional
 
 
 class VehicleStatus(Enum):
@@ -15,6 +14,22 @@ class VehicleStatus(Enum):
     SOLD = "sold"
 
 
+# Status -> string sem passar pelo descriptor .value a cada linha serializada
+VEHICLE_STATUS_STR = {status: status.value for status in VehicleStatus}
+
+# string -> Status sem passar por VehicleStatus(...): aceita o valor e o nome
+# (minúsculo/maiúsculo); outras grafias caem no construtor com lower()
+VEHICLE_STATUS_FROM_STR = {
+    **{status.value: status for status in VehicleStatus},
+    **{status.name: status for status in VehicleStatus},
+}
+
+
+def parse_vehicle_status(value: str) -> 'VehicleStatus':
+    """Converte a string do repositório para VehicleStatus"""
+    return VEHICLE_STATUS_FROM_STR.get(value) or VehicleStatus(value.lower())
+
+
 class Vehicle:
     """
     Entidade Vehicle - Representa um veículo no domínio
@@ -25,6 +40,10 @@ class Vehicle:
     - Lógica de domínio sem dependências externas
     """
     
+    # Atributos fixos: sem __dict__ por instância
+    __slots__ = ('_id', '_brand', '_model', '_year', '_price_cents', '_color',
+                 '_status', '_created_at', '_updated_at')
+    
     def __init__(
         self,
         brand: str,
@@ -35,17 +54,62 @@ class Vehicle:
         vehicle_id: Optional[int] = None,
         status: VehicleStatus = VehicleStatus.AVAILABLE,
         created_at: Optional[datetime] = None,
-        updated_at: Optional[datetime] = None
+        updated_at: Optional[datetime] = None,
+        _now: Optional[datetime] = None
     ):
+        # Um único relógio por construção (ou por lote, quando _now é informado)
+        now = _now or datetime.now()
         self._id = vehicle_id
         self._brand = self._validate_brand(brand)
         self._model = self._validate_model(model)
-        self._year = self._validate_year(year)
-        self._price = self._validate_price(price)
+        self._year = self._validate_year(year, now)
+        self._price_cents = self._validate_price(price)
         self._color = self._validate_color(color)
         self._status = status
-        self._created_at = created_at or datetime.now()
-        self._updated_at = updated_at or datetime.now()
+        self._created_at = created_at or now
+        self._updated_at = updated_at or now
+    
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> 'Vehicle':
+        """
+        Reconstrói um veículo a partir de uma linha do repositório
+        
+        Os dados já foram validados na escrita, então não passam de novo pelas
+        regras de __init__; entradas do usuário continuam usando o construtor.
+        """
+        vehicle = cls.__new__(cls)
+        vehicle._id = row['id']
+        vehicle._brand = row['brand']
+        vehicle._model = row['model']
+        vehicle._year = row['year']
+        # Mesmo arredondamento de _validate_price (o DECIMAL do banco já chega como Decimal)
+        price = row['price']
+        if not isinstance(price, Decimal):
+            price = Decimal(str(price))
+        vehicle._price_cents = int(price.scaleb(2).to_integral_value())
+        vehicle._color = row['color']
+        vehicle._status = parse_vehicle_status(row['status'])
+        vehicle._created_at = row.get('created_at')
+        vehicle._updated_at = row.get('updated_at')
+        return vehicle
+    
+    def to_row(self) -> dict:
+        """
+        Dados do veículo no formato do repositório (inverso de from_row)
+        
+        Lê os slots direto, sem passar pelas properties; status vai como string.
+        """
+        return {
+            'id': self._id,
+            'brand': self._brand,
+            'model': self._model,
+            'year': self._year,
+            'price': Decimal(self._price_cents).scaleb(-2),
+            'color': self._color,
+            'status': VEHICLE_STATUS_STR[self._status],
+            'created_at': self._created_at,
+            'updated_at': self._updated_at
+        }
     
     # Getters (properties)
     @property
@@ -66,7 +130,12 @@ class Vehicle:
     
     @property
     def price(self) -> Decimal:
-        return self._price
+        return Decimal(self._price_cents).scaleb(-2)
+    
+    @property
+    def price_float(self) -> float:
+        """Preço como float para saída JSON; mesmo valor de float(price), sem criar o Decimal"""
+        return self._price_cents / 100
     
     @property
     def color(self) -> str:
@@ -100,25 +169,33 @@ class Vehicle:
         """Atualiza o preço do veículo"""
         if not self.is_available():
             raise ValueError("Não é possível alterar preço de veículo vendido")
-        self._price = self._validate_price(new_price)
+        self._price_cents = self._validate_price(new_price)
         self._updated_at = datetime.now()
     
     def update_details(self, brand: str = None, model: str = None, 
-                      year: int = None, color: str = None) -> None:
-        """Atualiza detalhes do veículo"""
+                      year: int = None, color: str = None, price: Decimal = None) -> None:
+        """
+        Atualiza detalhes (e opcionalmente o preço) do veículo
+        
+        Valida todos os campos informados antes de aplicar: um campo inválido
+        não deixa o veículo parcialmente alterado.
+        """
         if not self.is_available():
             raise ValueError("Não é possível alterar veículo vendido")
         
-        if brand:
-            self._brand = self._validate_brand(brand)
-        if model:
-            self._model = self._validate_model(model)
-        if year:
-            self._year = self._validate_year(year)
-        if color:
-            self._color = self._validate_color(color)
+        now = datetime.now()
+        brand = self._validate_brand(brand) if brand else self._brand
+        model = self._validate_model(model) if model else self._model
+        year = self._validate_year(year, now) if year else self._year
+        color = self._validate_color(color) if color else self._color
+        price_cents = self._validate_price(price) if price is not None else self._price_cents
         
-        self._updated_at = datetime.now()
+        self._brand = brand
+        self._model = model
+        self._year = year
+        self._color = color
+        self._price_cents = price_cents
+        self._updated_at = now
     
     # Validações de negócio (regras puras)
     def _validate_brand(self, brand: str) -> str:
@@ -132,8 +209,9 @@ class Vehicle:
         if len(brand) > 50:
             raise ValueError("Marca deve ter no máximo 50 caracteres")
         
-        # Apenas letras, números e espaços
-        if not re.match(r'^[a-zA-Z0-9\s]+$', brand):
+        # Apenas letras e números ASCII, separados por espaços
+        chars = ''.join(brand.split())
+        if not (chars.isascii() and chars.isalnum()):
             raise ValueError("Marca deve conter apenas letras, números e espaços")
         
         return brand.title()  # Primeira letra maiúscula
@@ -151,12 +229,12 @@ class Vehicle:
         
         return model.title()
     
-    def _validate_year(self, year: int) -> int:
+    def _validate_year(self, year: int, now: Optional[datetime] = None) -> int:
         """Valida o ano do veículo"""
         if not isinstance(year, int):
             raise ValueError("Ano deve ser um número inteiro")
         
-        current_year = datetime.now().year
+        current_year = (now or datetime.now()).year
         if year < 1900:
             raise ValueError("Ano deve ser maior que 1900")
         if year > current_year + 1:
@@ -164,19 +242,25 @@ class Vehicle:
         
         return year
     
-    def _validate_price(self, price: Decimal) -> Decimal:
-        """Valida o preço do veículo"""
+    def _validate_price(self, price: Decimal) -> int:
+        """Valida o preço do veículo e o devolve em centavos"""
         if not isinstance(price, (Decimal, int, float)):
             raise ValueError("Preço deve ser um número")
         
-        price = Decimal(str(price))
+        # Centavos inteiros: arredonda uma única vez (ROUND_HALF_EVEN, como o quantize)
+        if isinstance(price, int):
+            cents = price * 100
+        else:
+            if isinstance(price, float):
+                price = Decimal(str(price))
+            cents = int(price.scaleb(2).to_integral_value())
         
-        if price <= 0:
+        if cents <= 0:
             raise ValueError("Preço deve ser maior que zero")
-        if price > Decimal('9999999.99'):
+        if cents > 999_999_999:
             raise ValueError("Preço deve ser menor que R$ 9.999.999,99")
         
-        return price.quantize(Decimal('0.01'))  # 2 casas decimais
+        return cents
     
     def _validate_color(self, color: str) -> str:
         """Valida a cor do veículo"""
@@ -189,18 +273,19 @@ class Vehicle:
         if len(color) > 30:
             raise ValueError("Cor deve ter no máximo 30 caracteres")
         
-        # Apenas letras e espaços
-        if not re.match(r'^[a-zA-Z\s]+$', color):
+        # Apenas letras ASCII, separadas por espaços
+        chars = ''.join(color.split())
+        if not (chars.isascii() and chars.isalpha()):
             raise ValueError("Cor deve conter apenas letras e espaços")
         
         return color.title()
     
     def __str__(self) -> str:
-        return f"{self._brand} {self._model} {self._year} - {self._color} - R$ {self._price}"
+        return f"{self._brand} {self._model} {self._year} - {self._color} - R$ {self.price}"
     
     def __repr__(self) -> str:
         return (f"Vehicle(id={self._id}, brand='{self._brand}', model='{self._model}', "
-                f"year={self._year}, price={self._price}, color='{self._color}', "
+                f"year={self._year}, price={self.price}, color='{self._color}', "
                 f"status={self._status.value})")
     
     def __eq__(self, other) -> bool:
@@ -210,3 +295,30 @@ class Vehicle:
                 self._model == other._model and
                 self._year == other._year and
                 self._color == other._color)
+
+
+class VehicleBatch:
+    """
+    Lote de veículos em colunas (Structure of Arrays) para listagens
+    
+    Usado apenas na leitura em massa: os dados vêm do repositório já validados
+    na escrita, então não passam de novo pelas regras da Entity. Cada coluna é
+    uma lista e a posição i de todas elas descreve o mesmo veículo.
+    """
+    
+    __slots__ = ('ids', 'brands', 'models', 'years', 'prices', 'colors',
+                 'statuses', 'created_ats', 'updated_ats')
+    
+    def __init__(self, rows: List[Mapping[str, Any]]):
+        self.ids = [row['id'] for row in rows]
+        self.brands = [row['brand'] for row in rows]
+        self.models = [row['model'] for row in rows]
+        self.years = [row['year'] for row in rows]
+        self.prices = [float(row['price']) for row in rows]
+        self.colors = [row['color'] for row in rows]
+        self.statuses = [row['status'].lower() for row in rows]
+        self.created_ats = [row.get('created_at') for row in rows]
+        self.updated_ats = [row.get('updated_at') for row in rows]
+    
+    def __len__(self) -> int:
+        return len(self.ids)
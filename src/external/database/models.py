@@ -3,9 +3,11 @@ Configuração do banco de dados - Camada externa
 SQLAlchemy models e configuração de conexão
 """
 import os
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, ForeignKey, DECIMAL
+from functools import lru_cache
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, DECIMAL, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import relationship
 from datetime import datetime
 
 Base = declarative_base()
@@ -27,6 +29,12 @@ class VehicleModel(Base):
     
     # Relacionamento com vendas
     sale = relationship("SaleModel", back_populates="vehicle", uselist=False)
+    
+    # Listagens por status ordenadas por preço: filtro e ordenação saem do índice
+    # (o InnoDB anexa o id, que desempata a ordenação)
+    __table_args__ = (
+        Index('ix_vehicles_status_price', 'status', 'price'),
+    )
 
 
 class SaleModel(Base):
@@ -42,41 +50,58 @@ class SaleModel(Base):
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     
-    # Relacionamento com veículo
-    vehicle = relationship("VehicleModel", back_populates="sale")
+    # Relacionamento com veículo; lazy load proibido: quem precisar do veículo
+    # carrega explicitamente (joinedload/selectinload), sem N+1 escondido
+    vehicle = relationship("VehicleModel", back_populates="sale", lazy="raise")
 
 
 class DatabaseConfig:
     """Configuração do banco de dados"""
     
     @staticmethod
-    def get_database_url() -> str:
-        """Constrói URL do banco a partir de variáveis de ambiente"""
+    def get_database_url(driver: str = 'aiomysql') -> str:
+        """Constrói URL do banco a partir de variáveis de ambiente (aiomysql na API, pymysql no Alembic)"""
         db_host = os.getenv('DB_HOST', 'localhost')
         db_port = os.getenv('DB_PORT', '3306')
         db_name = os.getenv('DB_NAME', 'fiap_vehicles')
         db_user = os.getenv('DB_USER', 'root')
         db_password = os.getenv('DB_PASSWORD', 'password')
         
-        return f"mysql+pymysql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+        return f"mysql+{driver}://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
     
     @staticmethod
-    def create_engine():
-        """Cria engine do SQLAlchemy"""
+    def create_engine() -> AsyncEngine:
+        """Cria engine assíncrona do SQLAlchemy"""
         database_url = DatabaseConfig.get_database_url()
-        return create_engine(
+        # Pool por worker: o max_connections do MySQL deve comportar
+        # (DB_POOL_SIZE + DB_MAX_OVERFLOW) * workers * réplicas
+        return create_async_engine(
             database_url,
             pool_pre_ping=True,
             pool_recycle=300,
+            pool_size=int(os.getenv('DB_POOL_SIZE', '20')),
+            max_overflow=int(os.getenv('DB_MAX_OVERFLOW', '10')),
+            pool_timeout=int(os.getenv('DB_POOL_TIMEOUT', '30')),
+            pool_use_lifo=True,  # reaproveita a conexão mais recente (já autenticada e "quente")
+            # Cache LRU de SQL compilado: cada formato de consulta é compilado uma
+            # vez por engine (o aiomysql não tem prepared statements no servidor)
+            query_cache_size=int(os.getenv('DB_QUERY_CACHE_SIZE', '500')),
             echo=False
         )
     
     @staticmethod
-    def create_tables(engine):
+    @lru_cache(maxsize=1)
+    def get_engine() -> AsyncEngine:
+        """Engine compartilhada pelo processo: um único pool de conexões por worker"""
+        return DatabaseConfig.create_engine()
+    
+    @staticmethod
+    async def create_tables(engine: AsyncEngine):
         """Cria todas as tabelas"""
-        Base.metadata.create_all(bind=engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
     
     @staticmethod
-    def get_session_factory(engine):
-        """Retorna factory de sessões"""
-        return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    def get_session_factory(engine: AsyncEngine):
+        """Retorna factory de sessões assíncronas"""
+        return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
@@ -2,118 +2,136 @@
 Implementação do Repository de Vendas - Camada externa
 Implementa SaleRepositoryInterface usando SQLAlchemy
 """
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Mapping, Optional, Dict, Any
+from sqlalchemy import asc, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...gateways.sale_gateway import SaleRepositoryInterface
 from .models import SaleModel
 
 
+# Colunas lidas nas consultas (Core): linhas simples, sem hidratar SaleModel
+# As linhas (RowMapping, somente leitura) seguem ao gateway sem cópia para dict
+_SALE_COLUMNS = (
+    SaleModel.id,
+    SaleModel.vehicle_id,
+    SaleModel.customer_cpf,
+    SaleModel.sale_date,
+    SaleModel.amount,
+    SaleModel.payment_status,
+    SaleModel.created_at,
+    SaleModel.updated_at,
+)
+
+# Colunas que update() pode gravar (o id nunca muda)
+_UPDATABLE_FIELDS = frozenset(column.key for column in _SALE_COLUMNS) - {'id'}
+
+
 class SQLAlchemySaleRepository(SaleRepositoryInterface):
     """
     Implementação concreta do repositório de vendas usando SQLAlchemy
     Camada externa - pode usar frameworks e bibliotecas
+    Sem commit aqui: a transação é da requisição (get_db_session). Escrita que
+    falha faz rollback, desfazendo a requisição inteira mesmo se o erro não propagar
     """
     
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self._session = session
     
-    def save(self, sale_data: dict) -> dict:
+    async def save(self, sale_data: dict) -> dict:
         """Salva uma venda no banco de dados"""
         try:
-            # Cria modelo SQLAlchemy
-            sale_model = SaleModel(
-                vehicle_id=sale_data['vehicle_id'],
-                customer_cpf=sale_data['customer_cpf'],
-                sale_date=sale_data['sale_date'],
-                amount=sale_data['amount'],
-                payment_status=sale_data['payment_status']
+            # INSERT direto (Core): uma ida ao banco, sem objeto ORM nem refresh
+            result = await self._session.execute(
+                insert(SaleModel).values(
+                    vehicle_id=sale_data['vehicle_id'],
+                    customer_cpf=sale_data['customer_cpf'],
+                    sale_date=sale_data['sale_date'],
+                    amount=sale_data['amount'],
+                    payment_status=sale_data['payment_status']
+                )
             )
-            
-            # Persiste no banco
-            self._session.add(sale_model)
-            self._session.commit()
-            self._session.refresh(sale_model)
-            
-            # Converte de volta para dict
-            return self._model_to_dict(sale_model)
+            # Valores inseridos (com os defaults calculados) + ID gerado pelo banco
+            return {
+                'id': result.inserted_primary_key[0],
+                **result.last_inserted_params()
+            }
             
         except Exception as e:
-            self._session.rollback()
+            await self._session.rollback()
             raise Exception(f"Erro ao salvar venda: {str(e)}")
     
-    def find_by_id(self, sale_id: int) -> Optional[dict]:
+    async def find_by_id(self, sale_id: int) -> Optional[Mapping[str, Any]]:
         """Busca uma venda por ID"""
         try:
-            sale_model = self._session.query(SaleModel).filter(
-                SaleModel.id == sale_id
-            ).first()
+            row = (await self._session.execute(
+                select(*_SALE_COLUMNS).where(SaleModel.id == sale_id)
+            )).mappings().one_or_none()
             
-            if not sale_model:
+            if not row:
                 return None
             
-            return self._model_to_dict(sale_model)
+            return row
             
         except Exception as e:
             raise Exception(f"Erro ao buscar venda: {str(e)}")
     
-    def find_by_vehicle_id(self, vehicle_id: int) -> Optional[dict]:
+    async def find_by_vehicle_id(self, vehicle_id: int) -> Optional[Mapping[str, Any]]:
         """Busca uma venda por ID do veículo"""
         try:
-            sale_model = self._session.query(SaleModel).filter(
-                SaleModel.vehicle_id == vehicle_id
-            ).first()
+            row = (await self._session.execute(
+                select(*_SALE_COLUMNS).where(SaleModel.vehicle_id == vehicle_id)
+            )).mappings().one_or_none()
             
-            if not sale_model:
+            if not row:
                 return None
             
-            return self._model_to_dict(sale_model)
+            return row
             
         except Exception as e:
             raise Exception(f"Erro ao buscar venda por veículo: {str(e)}")
     
-    def find_all(self) -> List[dict]:
-        """Busca todas as vendas"""
+    async def find_all(self, limit: int = 100, offset: int = 0) -> List[Mapping[str, Any]]:
+        """Busca uma página de vendas (LIMIT/OFFSET no banco)"""
         try:
-            sale_models = self._session.query(SaleModel).all()
-            return [self._model_to_dict(model) for model in sale_models]
+            rows = (await self._session.execute(
+                select(*_SALE_COLUMNS).order_by(asc(SaleModel.id)).limit(limit).offset(offset)
+            )).mappings().all()
+            return rows
             
         except Exception as e:
             raise Exception(f"Erro ao listar vendas: {str(e)}")
     
-    def update(self, sale_id: int, sale_data: dict) -> dict:
+    async def update(self, sale_id: int, sale_data: dict) -> dict:
         """Atualiza uma venda"""
         try:
-            sale_model = self._session.query(SaleModel).filter(
-                SaleModel.id == sale_id
-            ).first()
+            # UPDATE direto (Core) só com as colunas permitidas: sem carregar o objeto ORM
+            values = {key: value for key, value in sale_data.items() if key in _UPDATABLE_FIELDS}
+            result = await self._session.execute(
+                update(SaleModel).where(SaleModel.id == sale_id).values(**values)
+            )
             
-            if not sale_model:
+            if result.rowcount == 0:
                 raise ValueError(f"Venda com ID {sale_id} não encontrada")
             
-            # Atualiza os campos
-            for key, value in sale_data.items():
-                if hasattr(sale_model, key) and key != 'id':
-                    setattr(sale_model, key, value)
-            
-            self._session.commit()
-            self._session.refresh(sale_model)
-            
-            return self._model_to_dict(sale_model)
+            return {'id': sale_id, **values}
             
         except Exception as e:
-            self._session.rollback()
+            await self._session.rollback()
             raise Exception(f"Erro ao atualizar venda: {str(e)}")
     
-    def _model_to_dict(self, sale_model: SaleModel) -> dict:
-        """Converte modelo SQLAlchemy para dicionário"""
-        return {
-            'id': sale_model.id,
-            'vehicle_id': sale_model.vehicle_id,
-            'customer_cpf': sale_model.customer_cpf,
-            'sale_date': sale_model.sale_date,
-            'amount': float(sale_model.amount),
-            'payment_status': sale_model.payment_status,
-            'created_at': sale_model.created_at,
-            'updated_at': sale_model.updated_at
-        }
+    async def update_payment_status(self, sale_id: int, expected_status: str,
+                                    payment_status: str, updated_at: datetime) -> bool:
+        """Troca o status de pagamento em um único UPDATE condicionado ao status atual"""
+        try:
+            result = await self._session.execute(
+                update(SaleModel)
+                .where(SaleModel.id == sale_id, SaleModel.payment_status == expected_status)
+                .values(payment_status=payment_status, updated_at=updated_at)
+            )
+            return result.rowcount == 1
+            
+        except Exception as e:
+            await self._session.rollback()
+            raise Exception(f"Erro ao atualizar status de pagamento: {str(e)}")
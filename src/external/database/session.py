@@ -0,0 +1,27 @@
+"""
+Sessão do banco por requisição - Camada externa
+Única fronteira de transação da API: os routers injetam get_db_session, os repositórios não fazem commit
+"""
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import DatabaseConfig
+
+
+# Factory de sessões sobre a engine compartilhada (criada uma vez por worker)
+SessionLocal = DatabaseConfig.get_session_factory(DatabaseConfig.get_engine())
+
+
+async def get_db_session() -> AsyncIterator[AsyncSession]:
+    """
+    Dependency para obter sessão assíncrona do banco (conexão vem do pool)
+    Uma transação por requisição: commit ao sair do endpoint, rollback se ele levantar
+    """
+    async with SessionLocal() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
@@ -2,149 +2,229 @@
 Implementação do Repository de Veículos - Camada externa
 Implementa VehicleRepositoryInterface usando SQLAlchemy
 """
-from typing import List, Optional, Dict, Any
+import os
+from time import monotonic
+from typing import List, Mapping, Optional, Dict, Any, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import asc
+from sqlalchemy import asc, event, insert, select, update
 
 from ...gateways.vehicle_gateway import VehicleRepositoryInterface
-from .models import VehicleModel
+from .models import SaleModel, VehicleModel
+
+
+# Colunas lidas nas consultas (Core): linhas simples, sem hidratar VehicleModel
+# As linhas (RowMapping, somente leitura) seguem ao gateway sem cópia para dict
+_VEHICLE_COLUMNS = (
+    VehicleModel.id,
+    VehicleModel.brand,
+    VehicleModel.model,
+    VehicleModel.year,
+    VehicleModel.price,
+    VehicleModel.color,
+    VehicleModel.status,
+    VehicleModel.created_at,
+    VehicleModel.updated_at,
+)
+
+# Colunas das listagens por status: a resposta é o formato público (sem timestamps)
+_VEHICLE_PUBLIC_COLUMNS = tuple(
+    column for column in _VEHICLE_COLUMNS
+    if column.key not in ('created_at', 'updated_at')
+)
+
+# Colunas que update() pode gravar (o id nunca muda)
+_UPDATABLE_FIELDS = frozenset(column.key for column in _VEHICLE_COLUMNS) - {'id'}
+
+# Cache em memória (por worker) das listagens por status: (status, limit, offset) ->
+# (expira_em, linhas). Escritas no mesmo worker invalidam após o commit; entre workers vale o TTL
+_STATUS_LIST_CACHE_TTL = float(os.getenv('VEHICLE_LIST_CACHE_TTL', '30'))
+_STATUS_LIST_CACHE_MAXSIZE = 256
+_status_list_cache: Dict[Tuple[str, int, int], Tuple[float, List[Mapping[str, Any]]]] = {}
+
+# Muda a cada invalidação: leitura que começou antes de um commit não volta a preencher o cache
+_status_list_generation = 0
+
+# Marca em session.info: a transação atual da sessão escreveu veículos
+_INVALIDATE_ON_COMMIT = 'invalidate_vehicle_status_lists'
+
+
+def _invalidate_status_list_cache(session: Session) -> None:
+    """Descarta as listagens em cache se a transação escreveu veículos (after_commit: escritas já visíveis)"""
+    global _status_list_generation
+    if session.info.pop(_INVALIDATE_ON_COMMIT, None):
+        _status_list_generation += 1
+        _status_list_cache.clear()
+
+
+def _invalidate_status_lists_after_commit(session: Session) -> None:
+    """Agenda a invalidação do cache para o commit da transação da sessão"""
+    session.info[_INVALIDATE_ON_COMMIT] = True
+    if not event.contains(session, 'after_commit', _invalidate_status_list_cache):
+        event.listen(session, 'after_commit', _invalidate_status_list_cache)
+
+
+def _store_status_list(key: Tuple[str, int, int], generation: int, rows: List[Mapping[str, Any]]) -> None:
+    """Guarda a página lida, a menos que um commit tenha invalidado o cache durante a leitura"""
+    if _STATUS_LIST_CACHE_TTL <= 0 or generation != _status_list_generation:
+        return
+    if len(_status_list_cache) >= _STATUS_LIST_CACHE_MAXSIZE:
+        _status_list_cache.clear()
+    _status_list_cache[key] = (monotonic() + _STATUS_LIST_CACHE_TTL, rows)
 
 
 class SQLAlchemyVehicleRepository(VehicleRepositoryInterface):
     """
     Implementação concreta do repositório de veículos usando SQLAlchemy
     Camada externa - pode usar frameworks e bibliotecas
+    Sem commit aqui: a transação é da requisição (get_db_session). Escrita que
+    falha faz rollback, desfazendo a requisição inteira mesmo se o erro não propagar
     """
     
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self._session = session
     
-    def save(self, vehicle_data: dict) -> dict:
+    async def save(self, vehicle_data: dict) -> dict:
         """Salva um veículo no banco de dados"""
         try:
-            # Cria modelo SQLAlchemy
-            vehicle_model = VehicleModel(
-                brand=vehicle_data['brand'],
-                model=vehicle_data['model'],
-                year=vehicle_data['year'],
-                price=vehicle_data['price'],
-                color=vehicle_data['color'],
-                status=vehicle_data['status']
+            # INSERT direto (Core): uma ida ao banco, sem objeto ORM nem refresh
+            result = await self._session.execute(
+                insert(VehicleModel).values(
+                    brand=vehicle_data['brand'],
+                    model=vehicle_data['model'],
+                    year=vehicle_data['year'],
+                    price=vehicle_data['price'],
+                    color=vehicle_data['color'],
+                    status=vehicle_data['status']
+                )
             )
+            _invalidate_status_lists_after_commit(self._session.sync_session)
             
-            # Persiste no banco
-            self._session.add(vehicle_model)
-            self._session.commit()
-            self._session.refresh(vehicle_model)
-            
-            # Converte de volta para dict
-            return self._model_to_dict(vehicle_model)
+            # Valores inseridos (com os defaults calculados) + ID gerado pelo banco
+            return {
+                'id': result.inserted_primary_key[0],
+                **result.last_inserted_params()
+            }
             
         except Exception as e:
-            self._session.rollback()
+            await self._session.rollback()
             raise Exception(f"Erro ao salvar veículo: {str(e)}")
     
-    def find_by_id(self, vehicle_id: int) -> Optional[dict]:
-        """Busca um veículo por ID"""
+    async def find_by_id(self, vehicle_id: int, for_update: bool = False) -> Optional[Mapping[str, Any]]:
+        """Busca um veículo por ID (SELECT ... FOR UPDATE quando for_update)"""
         try:
-            vehicle_model = self._session.query(VehicleModel).filter(
-                VehicleModel.id == vehicle_id
-            ).first()
+            query = select(*_VEHICLE_COLUMNS).where(VehicleModel.id == vehicle_id)
+            if for_update:
+                query = query.with_for_update()
             
-            if not vehicle_model:
+            row = (await self._session.execute(query)).mappings().one_or_none()
+            
+            if not row:
                 return None
             
-            return self._model_to_dict(vehicle_model)
+            return row
             
         except Exception as e:
             raise Exception(f"Erro ao buscar veículo: {str(e)}")
     
-    def find_all(self) -> List[dict]:
-        """Busca todos os veículos"""
+    async def find_by_id_for_sale(self, vehicle_id: int) -> Optional[Mapping[str, Any]]:
+        """Busca um veículo e o id da sua venda (LEFT JOIN) com SELECT ... FOR UPDATE"""
         try:
-            vehicle_models = self._session.query(VehicleModel).all()
-            return [self._model_to_dict(model) for model in vehicle_models]
+            return (await self._session.execute(
+                select(*_VEHICLE_COLUMNS, SaleModel.id.label('sale_id'))
+                .select_from(VehicleModel)
+                .outerjoin(SaleModel, SaleModel.vehicle_id == VehicleModel.id)
+                .where(VehicleModel.id == vehicle_id)
+                .with_for_update()
+            )).mappings().one_or_none()
             
         except Exception as e:
-            raise Exception(f"Erro ao listar veículos: {str(e)}")
+            raise Exception(f"Erro ao buscar veículo para venda: {str(e)}")
     
-    def find_available_ordered_by_price(self) -> List[dict]:
-        """Busca veículos disponíveis ordenados por preço"""
+    async def find_all(self, limit: int = 100, offset: int = 0) -> List[Mapping[str, Any]]:
+        """Busca uma página de veículos (LIMIT/OFFSET no banco)"""
         try:
-            vehicle_models = self._session.query(VehicleModel).filter(
-                VehicleModel.status == 'available'
-            ).order_by(asc(VehicleModel.price)).all()
+            rows = (await self._session.execute(
+                select(*_VEHICLE_COLUMNS).order_by(asc(VehicleModel.id)).limit(limit).offset(offset)
+            )).mappings().all()
+            return rows
             
-            return [self._model_to_dict(model) for model in vehicle_models]
+        except Exception as e:
+            raise Exception(f"Erro ao listar veículos: {str(e)}")
+    
+    async def find_available_ordered_by_price(self, limit: int = 100, offset: int = 0) -> List[Mapping[str, Any]]:
+        """Busca uma página de veículos disponíveis ordenados por preço"""
+        try:
+            return await self._find_by_status_ordered_by_price('available', limit, offset)
             
         except Exception as e:
             raise Exception(f"Erro ao buscar veículos disponíveis: {str(e)}")
     
-    def find_sold_ordered_by_price(self) -> List[dict]:
-        """Busca veículos vendidos ordenados por preço"""
+    async def find_sold_ordered_by_price(self, limit: int = 100, offset: int = 0) -> List[Mapping[str, Any]]:
+        """Busca uma página de veículos vendidos ordenados por preço"""
         try:
-            vehicle_models = self._session.query(VehicleModel).filter(
-                VehicleModel.status == 'sold'
-            ).order_by(asc(VehicleModel.price)).all()
-            
-            return [self._model_to_dict(model) for model in vehicle_models]
+            return await self._find_by_status_ordered_by_price('sold', limit, offset)
             
         except Exception as e:
             raise Exception(f"Erro ao buscar veículos vendidos: {str(e)}")
     
-    def update(self, vehicle_id: int, vehicle_data: dict) -> dict:
+    async def _find_by_status_ordered_by_price(self, status: str, limit: int, offset: int) -> List[Mapping[str, Any]]:
+        """Página de veículos de um status ordenados por preço, servida do cache enquanto válida"""
+        key = (status, limit, offset)
+        cached = _status_list_cache.get(key)
+        if cached and cached[0] > monotonic():
+            return cached[1]
+        
+        generation = _status_list_generation
+        # id desempata preços iguais para a paginação ser estável
+        vehicles = (await self._session.execute(
+            select(*_VEHICLE_PUBLIC_COLUMNS)
+            .where(VehicleModel.status == status)
+            .order_by(asc(VehicleModel.price), asc(VehicleModel.id))
+            .limit(limit)
+            .offset(offset)
+        )).mappings().all()
+        _store_status_list(key, generation, vehicles)
+        
+        return vehicles
+    
+    async def update(self, vehicle_id: int, vehicle_data: dict) -> dict:
         """Atualiza um veículo"""
         try:
-            vehicle_model = self._session.query(VehicleModel).filter(
-                VehicleModel.id == vehicle_id
-            ).first()
+            # UPDATE direto (Core) só com as colunas permitidas: sem carregar o objeto ORM
+            values = {key: value for key, value in vehicle_data.items() if key in _UPDATABLE_FIELDS}
+            result = await self._session.execute(
+                update(VehicleModel).where(VehicleModel.id == vehicle_id).values(**values)
+            )
             
-            if not vehicle_model:
+            if result.rowcount == 0:
                 raise ValueError(f"Veículo com ID {vehicle_id} não encontrado")
             
-            # Atualiza os campos
-            for key, value in vehicle_data.items():
-                if hasattr(vehicle_model, key) and key != 'id':
-                    setattr(vehicle_model, key, value)
-            
-            self._session.commit()
-            self._session.refresh(vehicle_model)
+            _invalidate_status_lists_after_commit(self._session.sync_session)
             
-            return self._model_to_dict(vehicle_model)
+            return {'id': vehicle_id, **values}
             
         except Exception as e:
-            self._session.rollback()
+            await self._session.rollback()
             raise Exception(f"Erro ao atualizar veículo: {str(e)}")
     
-    def delete(self, vehicle_id: int) -> bool:
+    async def delete(self, vehicle_id: int) -> bool:
         """Remove um veículo"""
         try:
-            vehicle_model = self._session.query(VehicleModel).filter(
-                VehicleModel.id == vehicle_id
-            ).first()
+            vehicle_model = (await self._session.execute(
+                select(VehicleModel).where(VehicleModel.id == vehicle_id)
+            )).scalar_one_or_none()
             
             if not vehicle_model:
                 return False
             
-            self._session.delete(vehicle_model)
-            self._session.commit()
+            await self._session.delete(vehicle_model)
+            # flush já aqui: violação de FK (veículo com venda) estoura dentro do try
+            await self._session.flush()
+            _invalidate_status_lists_after_commit(self._session.sync_session)
             
             return True
             
         except Exception as e:
-            self._session.rollback()
+            await self._session.rollback()
             raise Exception(f"Erro ao excluir veículo: {str(e)}")
-    
-    def _model_to_dict(self, vehicle_model: VehicleModel) -> dict:
-        """Converte modelo SQLAlchemy para dicionário"""
-        return {
-            'id': vehicle_model.id,
-            'brand': vehicle_model.brand,
-            'model': vehicle_model.model,
-            'year': vehicle_model.year,
-            'price': float(vehicle_model.price),
-            'color': vehicle_model.color,
-            'status': vehicle_model.status,
-            'created_at': vehicle_model.created_at,
-            'updated_at': vehicle_model.updated_at
-        }
@@ -0,0 +1,27 @@
+"""
+Tradução dos erros de domínio para respostas HTTP
+Camada externa - um único handler no lugar do try/except de cada endpoint
+"""
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+
+from ...controllers.errors import DomainError, ValidationError, NotFoundError, InternalError
+
+
+# Status HTTP de cada erro de domínio
+_STATUS_BY_ERROR = {
+    ValidationError: status.HTTP_400_BAD_REQUEST,
+    NotFoundError: status.HTTP_404_NOT_FOUND,
+    InternalError: status.HTTP_500_INTERNAL_SERVER_ERROR,
+}
+
+
+async def domain_error_handler(request: Request, exc: DomainError) -> JSONResponse:
+    """
+    Converte DomainError na resposta de erro da API
+    Mantém o formato do HTTPException ({"detail": ...}) usado pelos clientes
+    """
+    return JSONResponse(
+        status_code=_STATUS_BY_ERROR.get(type(exc), status.HTTP_500_INTERNAL_SERVER_ERROR),
+        content={'detail': exc.detail}
+    )
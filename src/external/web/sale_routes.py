@@ -2,12 +2,11 @@
 Web Controller de Vendas - Camada externa da API
 Controller HTTP que usa frameworks (FastAPI) e injeta repositórios na Clean Architecture
 """
-from fastapi import APIRouter, HTTPException, Depends, status
-from sqlalchemy.orm import Session
-from decimal import Decimal
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...controllers.sale_controller import SaleController
-from ..database.models import DatabaseConfig
+from ..database.session import get_db_session
 from ..database.sale_repository import SQLAlchemySaleRepository
 from ..database.vehicle_repository import SQLAlchemyVehicleRepository
 from .schemas import SaleCreate, SaleResponse, PaymentWebhook, PaymentStatusUpdate
@@ -17,18 +16,7 @@ from .schemas import SaleCreate, SaleResponse, PaymentWebhook, PaymentStatusUpda
 router = APIRouter(prefix="/sales", tags=["sales"])
 
 
-def get_db_session():
-    """Dependency para obter sessão do banco"""
-    engine = DatabaseConfig.create_engine()
-    SessionLocal = DatabaseConfig.get_session_factory(engine)
-    session = SessionLocal()
-    try:
-        yield session
-    finally:
-        session.close()
-
-
-def get_sale_controller(session: Session = Depends(get_db_session)) -> SaleController:
+def get_sale_controller(session: AsyncSession = Depends(get_db_session, scope="function")) -> SaleController:
     """
     Dependency para obter SaleController com repositórios injetados
     Aqui é onde a magia da Clean Architecture acontece:
@@ -56,7 +44,7 @@ async def create_sale(
     4. Retorna resposta formatada
     """
     try:
-        result = controller.create_sale(
+        result = await controller.create_sale(
             vehicle_id=sale_data.vehicle_id,
             customer_cpf=sale_data.customer_cpf,
             amount=sale_data.amount
@@ -93,7 +81,7 @@ async def get_sale(
 ):
     """Endpoint para buscar uma venda por ID"""
     try:
-        result = controller.find_sale_by_id(sale_id)
+        result = await controller.find_sale_by_id(sale_id)
         
         if result.get('error'):
             if result.get('error_code') == 'SALE_NOT_FOUND':
@@ -125,7 +113,7 @@ async def get_sale_by_vehicle(
 ):
     """Endpoint para buscar uma venda por ID do veículo"""
     try:
-        result = controller.find_sale_by_vehicle_id(vehicle_id)
+        result = await controller.find_sale_by_vehicle_id(vehicle_id)
         
         if result.get('error'):
             if result.get('error_code') == 'SALE_NOT_FOUND':
@@ -152,11 +140,13 @@ async def get_sale_by_vehicle(
 
 @router.get("/", response_model=dict)
 async def list_sales(
+    limit: int = Query(100, ge=1, le=1000, description="Quantidade máxima de vendas"),
+    offset: int = Query(0, ge=0, description="Quantidade de vendas a pular"),
     controller: SaleController = Depends(get_sale_controller)
 ):
     """Endpoint para listar todas as vendas"""
     try:
-        result = controller.list_all_sales()
+        result = await controller.list_all_sales(limit=limit, offset=offset)
         
         if result.get('error'):
             raise HTTPException(
@@ -185,9 +175,9 @@ async def update_payment_status(
 ):
     """Endpoint para atualizar status de pagamento"""
     try:
-        result = controller.update_payment_status(
+        result = await controller.update_payment_status(
             sale_id=sale_id,
-            payment_status=payment_data.payment_status
+            payment_status=payment_data.payment_status.value
         )
         
         if result.get('error'):
@@ -230,9 +220,9 @@ async def payment_webhook(
     chamadas com os mesmos dados não causem problemas
     """
     try:
-        result = controller.process_payment_webhook({
+        result = await controller.process_payment_webhook({
             'sale_id': webhook_data.sale_id,
-            'status': webhook_data.status
+            'status': webhook_data.status.value
         })
         
         # Webhook sempre retorna 200, mesmo com erros de negócio
@@ -258,7 +248,7 @@ async def get_payment_status(
 ):
     """Endpoint para consultar status de pagamento"""
     try:
-        result = controller.get_payment_status(sale_id)
+        result = await controller.get_payment_status(sale_id)
         
         if result.get('error'):
             if result.get('error_code') == 'SALE_NOT_FOUND':
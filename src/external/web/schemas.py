@@ -6,6 +6,39 @@ from pydantic import BaseModel, Field, validator
 from decimal import Decimal
 from typing import Optional
 from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+from time import time
+
+
+@lru_cache(maxsize=1)
+def _year_for_hour(hour: int) -> int:
+    """Ano corrente, recalculado só quando muda a hora (chave do cache)"""
+    return datetime.now().year
+
+
+def _current_year() -> int:
+    """Ano corrente sem montar um datetime a cada validação"""
+    return _year_for_hour(int(time()) // 3600)
+
+
+@lru_cache(maxsize=256)
+def _title(v: str) -> str:
+    """title() memoizado: marcas e cores se repetem muito entre requisições"""
+    return v.title()
+
+
+class PaymentStatusInput(str, Enum):
+    """Status de pagamento aceitos em webhooks e atualizações (validados pelo Pydantic)"""
+    APPROVED = 'approved'
+    REJECTED = 'rejected'
+    
+    @classmethod
+    def _missing_(cls, value):
+        # Aceita qualquer capitalização ('APPROVED', 'Approved')
+        if isinstance(value, str):
+            return cls._value2member_map_.get(value.lower())
+        return None
 
 
 class VehicleCreate(BaseModel):
@@ -20,11 +53,11 @@ class VehicleCreate(BaseModel):
     def validate_text_fields(cls, v):
         if not v.replace(' ', '').isalpha():
             raise ValueError('Deve conter apenas letras e espaços')
-        return v.title()
+        return _title(v)
     
     @validator('year')
     def validate_year(cls, v):
-        current_year = datetime.now().year
+        current_year = _current_year()
         if v > current_year + 1:
             raise ValueError(f'Ano não pode ser maior que {current_year + 1}')
         return v
@@ -42,12 +75,12 @@ class VehicleUpdate(BaseModel):
     def validate_text_fields(cls, v):
         if v and not v.replace(' ', '').isalpha():
             raise ValueError('Deve conter apenas letras e espaços')
-        return v.title() if v else v
+        return _title(v) if v else v
     
     @validator('year')
     def validate_year(cls, v):
         if v:
-            current_year = datetime.now().year
+            current_year = _current_year()
             if v > current_year + 1:
                 raise ValueError(f'Ano não pode ser maior que {current_year + 1}')
         return v
@@ -74,11 +107,11 @@ class SaleCreate(BaseModel):
     
     @validator('customer_cpf')
     def validate_cpf_format(cls, v):
-        # Remove caracteres não numéricos
-        numbers_only = ''.join(filter(str.isdigit, v))
+        # Normaliza uma única vez: as camadas seguintes recebem só os 11 dígitos
+        numbers_only = v if v.isdigit() else ''.join(filter(str.isdigit, v))
         if len(numbers_only) != 11:
             raise ValueError('CPF deve ter 11 dígitos')
-        return v
+        return numbers_only
 
 
 class SaleResponse(BaseModel):
@@ -96,23 +129,9 @@ class SaleResponse(BaseModel):
 class PaymentWebhook(BaseModel):
     """Schema para webhook de pagamento"""
     sale_id: int = Field(..., gt=0, description="ID da venda")
-    status: str = Field(..., description="Status do pagamento")
-    
-    @validator('status')
-    def validate_status(cls, v):
-        allowed_statuses = ['approved', 'rejected']
-        if v.lower() not in allowed_statuses:
-            raise ValueError(f'Status deve ser um de: {allowed_statuses}')
-        return v.lower()
+    status: PaymentStatusInput = Field(..., description="Status do pagamento")
 
 
 class PaymentStatusUpdate(BaseModel):
     """Schema para atualização de status de pagamento"""
-    payment_status: str = Field(..., description="Novo status do pagamento")
-    
-    @validator('payment_status')
-    def validate_payment_status(cls, v):
-        allowed_statuses = ['approved', 'rejected']
-        if v.lower() not in allowed_statuses:
-            raise ValueError(f'Status deve ser um de: {allowed_statuses}')
-        return v.lower()
+    payment_status: PaymentStatusInput = Field(..., description="Novo status do pagamento")
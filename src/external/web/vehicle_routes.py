@@ -2,34 +2,25 @@
 Web Controller de Veículos - Camada externa da API
 Controller HTTP que usa frameworks (FastAPI) e injeta repositórios na Clean Architecture
 """
-from fastapi import APIRouter, HTTPException, Depends, status
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from decimal import Decimal
-from typing import List
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...controllers.vehicle_controller import VehicleController
-from ..database.models import DatabaseConfig
+from ..database.session import get_db_session
 from ..database.vehicle_repository import SQLAlchemyVehicleRepository
-from .schemas import VehicleCreate, VehicleUpdate, VehicleResponse
+from .schemas import VehicleCreate, VehicleUpdate
 
 
 # Router do FastAPI (camada externa)
 router = APIRouter(prefix="/vehicles", tags=["vehicles"])
 
+# Listagens devolvem o corpo já serializado pelo Presenter: sem response_model,
+# só o tipo de conteúdo documentado no OpenAPI
+_LIST_RESPONSES = {200: {"description": "Página de veículos", "content": {"application/json": {}}}}
 
-def get_db_session():
-    """Dependency para obter sessão do banco"""
-    engine = DatabaseConfig.create_engine()
-    SessionLocal = DatabaseConfig.get_session_factory(engine)
-    session = SessionLocal()
-    try:
-        yield session
-    finally:
-        session.close()
 
-
-def get_vehicle_controller(session: Session = Depends(get_db_session)) -> VehicleController:
+def get_vehicle_controller(session: AsyncSession = Depends(get_db_session, scope="function")) -> VehicleController:
     """
     Dependency para obter VehicleController com repositório injetado
     Aqui é onde a magia da Clean Architecture acontece:
@@ -53,35 +44,9 @@ async def create_vehicle(
     1. FastAPI recebe e valida dados (Pydantic)
     2. Injeta repositório no Controller da Clean Architecture
     3. Controller orquestra: Gateway -> UseCase -> Presenter
-    4. Retorna resposta formatada
+    4. Retorna resposta formatada (erros viram DomainError, tratados em error_handlers)
     """
-    try:
-        result = controller.create_vehicle(
-            brand=vehicle_data.brand,
-            model=vehicle_data.model,
-            year=vehicle_data.year,
-            price=vehicle_data.price,
-            color=vehicle_data.color
-        )
-        
-        if result.get('error'):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=result
-            )
-        
-        return result
-        
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail={"error": str(e)}
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"error": "Erro interno do servidor"}
-        )
+    return await controller.create_vehicle(**vehicle_data.model_dump())
 
 
 @router.get("/{vehicle_id}", response_model=dict)
@@ -90,103 +55,46 @@ async def get_vehicle(
     controller: VehicleController = Depends(get_vehicle_controller)
 ):
     """Endpoint para buscar um veículo por ID"""
-    try:
-        result = controller.find_vehicle_by_id(vehicle_id)
-        
-        if result.get('error'):
-            if result.get('error_code') == 'VEHICLE_NOT_FOUND':
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=result
-                )
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=result
-                )
-        
-        return result
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"error": "Erro interno do servidor"}
-        )
+    return await controller.find_vehicle_by_id(vehicle_id)
 
 
-@router.get("/", response_model=dict)
+@router.get("/", response_class=Response, responses=_LIST_RESPONSES)
 async def list_vehicles(
+    limit: int = Query(100, ge=1, le=1000, description="Quantidade máxima de veículos"),
+    offset: int = Query(0, ge=0, description="Quantidade de veículos a pular"),
     controller: VehicleController = Depends(get_vehicle_controller)
 ):
     """Endpoint para listar todos os veículos"""
-    try:
-        result = controller.list_all_vehicles()
-        
-        if result.get('error'):
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=result
-            )
-        
-        return result
-        
-    except Exception as e:
-        print(f"Erro na listagem de veículos: {str(e)}")
-        print(f"Tipo do erro: {type(e)}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"error": f"Erro interno: {str(e)}"}
-        )
+    result = await controller.list_all_vehicles(limit=limit, offset=offset)
+    
+    # Corpo já serializado pelo Presenter
+    return Response(content=result['body'], media_type=result['content_type'])
 
 
-@router.get("/status/available", response_model=dict)
+@router.get("/status/available", response_class=Response, responses=_LIST_RESPONSES)
 async def list_available_vehicles(
+    limit: int = Query(100, ge=1, le=1000, description="Quantidade máxima de veículos"),
+    offset: int = Query(0, ge=0, description="Quantidade de veículos a pular"),
     controller: VehicleController = Depends(get_vehicle_controller)
 ):
     """Endpoint para listar veículos disponíveis ordenados por preço"""
-    try:
-        result = controller.list_available_vehicles()
-        
-        if result.get('error'):
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=result
-            )
-        
-        return result
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"error": "Erro interno do servidor"}
-        )
+    result = await controller.list_available_vehicles(limit=limit, offset=offset)
+    
+    # Corpo já serializado pelo Presenter
+    return Response(content=result['body'], media_type=result['content_type'])
 
 
-@router.get("/status/sold", response_model=dict)
+@router.get("/status/sold", response_class=Response, responses=_LIST_RESPONSES)
 async def list_sold_vehicles(
+    limit: int = Query(100, ge=1, le=1000, description="Quantidade máxima de veículos"),
+    offset: int = Query(0, ge=0, description="Quantidade de veículos a pular"),
     controller: VehicleController = Depends(get_vehicle_controller)
 ):
     """Endpoint para listar veículos vendidos ordenados por preço"""
-    try:
-        result = controller.list_sold_vehicles()
-        
-        if result.get('error'):
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=result
-            )
-        
-        return result
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"error": "Erro interno do servidor"}
-        )
+    result = await controller.list_sold_vehicles(limit=limit, offset=offset)
+    
+    # Corpo já serializado pelo Presenter
+    return Response(content=result['body'], media_type=result['content_type'])
 
 
 @router.put("/{vehicle_id}", response_model=dict)
@@ -196,43 +104,10 @@ async def update_vehicle(
     controller: VehicleController = Depends(get_vehicle_controller)
 ):
     """Endpoint para atualizar um veículo"""
-    try:
-        # Converte apenas campos que foram fornecidos
-        update_data = {}
-        if vehicle_data.brand is not None:
-            update_data['brand'] = vehicle_data.brand
-        if vehicle_data.model is not None:
-            update_data['model'] = vehicle_data.model
-        if vehicle_data.year is not None:
-            update_data['year'] = vehicle_data.year
-        if vehicle_data.price is not None:
-            update_data['price'] = vehicle_data.price
-        if vehicle_data.color is not None:
-            update_data['color'] = vehicle_data.color
-        
-        result = controller.update_vehicle(vehicle_id, **update_data)
-        
-        if result.get('error'):
-            if result.get('error_code') == 'VALIDATION_ERROR':
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=result
-                )
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=result
-                )
-        
-        return result
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"error": "Erro interno do servidor"}
-        )
+    # Apenas campos enviados pelo cliente; None explícito chega ao Use Case, que mantém o valor atual
+    update_data = vehicle_data.model_dump(exclude_unset=True)
+    
+    return await controller.update_vehicle(vehicle_id, **update_data)
 
 
 @router.delete("/{vehicle_id}", response_model=dict)
@@ -241,27 +116,4 @@ async def delete_vehicle(
     controller: VehicleController = Depends(get_vehicle_controller)
 ):
     """Endpoint para excluir um veículo"""
-    try:
-        result = controller.delete_vehicle(vehicle_id)
-        
-        if result.get('error'):
-            if result.get('error_code') == 'VALIDATION_ERROR':
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=result
-                )
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=result
-                )
-        
-        return result
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"error": "Erro interno do servidor"}
-        )
+    return await controller.delete_vehicle(vehicle_id)
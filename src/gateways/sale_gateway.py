@@ -3,39 +3,45 @@ Gateway de Vendas - Interface entre o mundo interno (Entity) e externo (Reposito
 Responsável por traduzir dados do repositório para Entity e vice-versa
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from decimal import Decimal
+from typing import Any, List, Mapping, Optional
+from datetime import datetime
 
-from ..entities.sale import Sale, PaymentStatus
+from ..entities.sale import PAYMENT_STATUS_STR, Sale, PaymentStatus
 
 
 class SaleRepositoryInterface(ABC):
     """Interface abstrata para o repositório de vendas (mundo externo)"""
     
     @abstractmethod
-    def save(self, sale_data: dict) -> dict:
+    async def save(self, sale_data: dict) -> dict:
         """Salva uma venda no repositório externo"""
         pass
     
     @abstractmethod
-    def find_by_id(self, sale_id: int) -> Optional[dict]:
+    async def find_by_id(self, sale_id: int) -> Optional[Mapping[str, Any]]:
         """Busca uma venda por ID no repositório externo"""
         pass
     
     @abstractmethod
-    def find_by_vehicle_id(self, vehicle_id: int) -> Optional[dict]:
+    async def find_by_vehicle_id(self, vehicle_id: int) -> Optional[Mapping[str, Any]]:
         """Busca uma venda por ID do veículo"""
         pass
     
     @abstractmethod
-    def find_all(self) -> List[dict]:
-        """Busca todas as vendas no repositório externo"""
+    async def find_all(self, limit: int = 100, offset: int = 0) -> List[Mapping[str, Any]]:
+        """Busca uma página de vendas no repositório externo"""
         pass
     
     @abstractmethod
-    def update(self, sale_id: int, sale_data: dict) -> dict:
+    async def update(self, sale_id: int, sale_data: dict) -> dict:
         """Atualiza uma venda no repositório externo"""
         pass
+    
+    @abstractmethod
+    async def update_payment_status(self, sale_id: int, expected_status: str,
+                                    payment_status: str, updated_at: datetime) -> bool:
+        """Troca o status de pagamento só se o atual for expected_status (False se não trocou)"""
+        pass
 
 
 class SaleGateway:
@@ -51,7 +57,7 @@ class SaleGateway:
     def __init__(self, repository: SaleRepositoryInterface):
         self._repository = repository
     
-    def save_sale(self, sale: Sale) -> Sale:
+    async def save_sale(self, sale: Sale) -> Sale:
         """
         Salva uma venda convertendo Entity -> DTO -> Repository -> Entity
         """
@@ -59,46 +65,46 @@ class SaleGateway:
         sale_data = self._entity_to_dict(sale)
         
         # Salva no repositório externo
-        saved_data = self._repository.save(sale_data)
+        saved_data = await self._repository.save(sale_data)
         
-        # Converte dados salvos de volta para Entity
-        return self._dict_to_entity(saved_data)
+        # Dados acabaram de ser validados pela Entity: reconstrói sem revalidar
+        return Sale.from_row(saved_data)
     
-    def find_sale_by_id(self, sale_id: int) -> Optional[Sale]:
+    async def find_sale_by_id(self, sale_id: int) -> Optional[Sale]:
         """
         Busca uma venda por ID convertendo Repository -> Entity
         """
         # Busca no repositório externo
-        sale_data = self._repository.find_by_id(sale_id)
+        sale_data = await self._repository.find_by_id(sale_id)
         
         if not sale_data:
             return None
         
-        # Converte dados do repositório para Entity
-        return self._dict_to_entity(sale_data)
+        # Converte dados do repositório para Entity (já validados na escrita)
+        return Sale.from_row(sale_data)
     
-    def find_sale_by_vehicle_id(self, vehicle_id: int) -> Optional[Sale]:
+    async def find_sale_by_vehicle_id(self, vehicle_id: int) -> Optional[Sale]:
         """
         Busca uma venda por ID do veículo
         """
-        sale_data = self._repository.find_by_vehicle_id(vehicle_id)
+        sale_data = await self._repository.find_by_vehicle_id(vehicle_id)
         
         if not sale_data:
             return None
         
-        return self._dict_to_entity(sale_data)
+        return Sale.from_row(sale_data)
     
-    def find_all_sales(self) -> List[Sale]:
+    async def find_all_sales(self, limit: int = 100, offset: int = 0) -> List[Sale]:
         """
-        Busca todas as vendas convertendo Repository -> List[Entity]
+        Busca uma página de vendas convertendo Repository -> List[Entity]
         """
-        # Busca no repositório externo
-        sales_data = self._repository.find_all()
+        # Busca no repositório externo (uma única consulta paginada)
+        sales_data = await self._repository.find_all(limit=limit, offset=offset)
         
-        # Converte lista de dados para lista de Entities
-        return [self._dict_to_entity(data) for data in sales_data]
+        # Converte lista de dados para lista de Entities (sem revalidar: vendas antigas continuam legíveis)
+        return list(map(Sale.from_row, sales_data))
     
-    def update_sale(self, sale: Sale) -> Sale:
+    async def update_sale(self, sale: Sale) -> Sale:
         """
         Atualiza uma venda convertendo Entity -> DTO -> Repository -> Entity
         """
@@ -109,10 +115,35 @@ class SaleGateway:
         sale_data = self._entity_to_dict(sale)
         
         # Atualiza no repositório externo
-        updated_data = self._repository.update(sale.id, sale_data)
+        updated_data = await self._repository.update(sale.id, sale_data)
+        
+        # Dados acabaram de ser validados pela Entity: reconstrói sem revalidar
+        return Sale.from_row(updated_data)
+    
+    async def update_sale_payment_status(self, sale: Sale, previous_status: PaymentStatus) -> Sale:
+        """
+        Persiste a transição de status de pagamento já aplicada na Entity
+        
+        Uma única escrita condicional (compare-and-set): se outra operação mudou o
+        status desde a leitura, nada é gravado e a transição é recusada
+        """
+        if not sale.id:
+            raise ValueError("Venda deve ter ID para ser atualizada")
+        
+        # Status inalterado (webhook repetido): nada a gravar
+        if sale.payment_status == previous_status:
+            return sale
+        
+        updated = await self._repository.update_payment_status(
+            sale.id,
+            expected_status=PAYMENT_STATUS_STR[previous_status],
+            payment_status=PAYMENT_STATUS_STR[sale.payment_status],
+            updated_at=sale.updated_at
+        )
+        if not updated:
+            raise ValueError(f"Status de pagamento da venda {sale.id} foi alterado por outra operação")
         
-        # Converte dados atualizados de volta para Entity
-        return self._dict_to_entity(updated_data)
+        return sale
     
     def _entity_to_dict(self, sale: Sale) -> dict:
         """
@@ -123,23 +154,8 @@ class SaleGateway:
             'vehicle_id': sale.vehicle_id,
             'customer_cpf': sale.customer_cpf,
             'sale_date': sale.sale_date,
-            'amount': float(sale.amount),  # Decimal -> float para persistência
-            'payment_status': sale.payment_status.value,  # Enum -> string
+            'amount': sale.amount,  # Decimal direto para a coluna DECIMAL
+            'payment_status': PAYMENT_STATUS_STR[sale.payment_status],  # Enum -> string
             'created_at': sale.created_at,
             'updated_at': sale.updated_at
         }
-    
-    def _dict_to_entity(self, data: dict) -> Sale:
-        """
-        Converte dicionário (dados do repositório) para Entity Sale
-        """
-        return Sale(
-            sale_id=data.get('id'),
-            vehicle_id=data['vehicle_id'],
-            customer_cpf=data['customer_cpf'],
-            sale_date=data['sale_date'],
-            amount=Decimal(str(data['amount'])),  # float -> Decimal
-            payment_status=PaymentStatus(data['payment_status'].lower()),  # string -> Enum (lowercase)
-            created_at=data.get('created_at'),
-            updated_at=data.get('updated_at')
-        )
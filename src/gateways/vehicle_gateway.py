@@ -3,47 +3,51 @@ Gateway de Veículos - Interface entre o mundo interno (Entity) e externo (Repos
 Responsável por traduzir dados do repositório para Entity e vice-versa
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from decimal import Decimal
+from typing import Any, List, Mapping, Optional, Tuple
 
-from ..entities.vehicle import Vehicle, VehicleStatus
+from ..entities.vehicle import Vehicle, VehicleBatch
 
 
 class VehicleRepositoryInterface(ABC):
     """Interface abstrata para o repositório de veículos (mundo externo)"""
     
     @abstractmethod
-    def save(self, vehicle_data: dict) -> dict:
+    async def save(self, vehicle_data: dict) -> dict:
         """Salva um veículo no repositório externo"""
         pass
     
     @abstractmethod
-    def find_by_id(self, vehicle_id: int) -> Optional[dict]:
-        """Busca um veículo por ID no repositório externo"""
+    async def find_by_id(self, vehicle_id: int, for_update: bool = False) -> Optional[Mapping[str, Any]]:
+        """Busca um veículo por ID no repositório externo (for_update trava a linha até o commit)"""
         pass
     
     @abstractmethod
-    def find_all(self) -> List[dict]:
-        """Busca todos os veículos no repositório externo"""
+    async def find_by_id_for_sale(self, vehicle_id: int) -> Optional[Mapping[str, Any]]:
+        """Busca um veículo por ID travando-o para venda, com 'sale_id' da venda existente (ou None)"""
         pass
     
     @abstractmethod
-    def find_available_ordered_by_price(self) -> List[dict]:
-        """Busca veículos disponíveis ordenados por preço"""
+    async def find_all(self, limit: int = 100, offset: int = 0) -> List[Mapping[str, Any]]:
+        """Busca uma página de veículos no repositório externo"""
         pass
     
     @abstractmethod
-    def find_sold_ordered_by_price(self) -> List[dict]:
-        """Busca veículos vendidos ordenados por preço"""
+    async def find_available_ordered_by_price(self, limit: int = 100, offset: int = 0) -> List[Mapping[str, Any]]:
+        """Busca uma página de veículos disponíveis ordenados por preço (pode omitir timestamps)"""
         pass
     
     @abstractmethod
-    def update(self, vehicle_id: int, vehicle_data: dict) -> dict:
+    async def find_sold_ordered_by_price(self, limit: int = 100, offset: int = 0) -> List[Mapping[str, Any]]:
+        """Busca uma página de veículos vendidos ordenados por preço (pode omitir timestamps)"""
+        pass
+    
+    @abstractmethod
+    async def update(self, vehicle_id: int, vehicle_data: dict) -> dict:
         """Atualiza um veículo no repositório externo"""
         pass
     
     @abstractmethod
-    def delete(self, vehicle_id: int) -> bool:
+    async def delete(self, vehicle_id: int) -> bool:
         """Remove um veículo do repositório externo"""
         pass
 
@@ -61,7 +65,7 @@ class VehicleGateway:
     def __init__(self, repository: VehicleRepositoryInterface):
         self._repository = repository
     
-    def save_vehicle(self, vehicle: Vehicle) -> Vehicle:
+    async def save_vehicle(self, vehicle: Vehicle) -> Vehicle:
         """
         Salva um veículo convertendo Entity -> DTO -> Repository -> Entity
         """
@@ -69,49 +73,66 @@ class VehicleGateway:
         vehicle_data = self._entity_to_dict(vehicle)
         
         # Salva no repositório externo
-        saved_data = self._repository.save(vehicle_data)
+        saved_data = await self._repository.save(vehicle_data)
         
-        # Converte dados salvos de volta para Entity
-        return self._dict_to_entity(saved_data)
+        # Dados acabaram de ser validados pela Entity: reconstrói sem revalidar
+        return Vehicle.from_row(saved_data)
     
-    def find_vehicle_by_id(self, vehicle_id: int) -> Optional[Vehicle]:
+    async def find_vehicle_by_id(self, vehicle_id: int, for_update: bool = False) -> Optional[Vehicle]:
         """
         Busca um veículo por ID convertendo Repository -> Entity
+        
+        for_update trava a linha até o fim da transação da requisição: use quando
+        o veículo lido será alterado e gravado de volta
         """
         # Busca no repositório externo
-        vehicle_data = self._repository.find_by_id(vehicle_id)
+        vehicle_data = await self._repository.find_by_id(vehicle_id, for_update=for_update)
         
         if not vehicle_data:
             return None
         
-        # Converte dados do repositório para Entity
-        return self._dict_to_entity(vehicle_data)
+        # Converte dados do repositório para Entity (sem revalidar)
+        return Vehicle.from_row(vehicle_data)
     
-    def find_all_vehicles(self) -> List[Vehicle]:
+    async def find_vehicle_for_sale(self, vehicle_id: int) -> Tuple[Optional[Vehicle], bool]:
         """
-        Busca todos os veículos convertendo Repository -> List[Entity]
+        Busca o veículo a ser vendido e se ele já tem venda, numa única consulta
+        
+        A linha fica travada até o fim da transação da requisição: duas vendas
+        simultâneas do mesmo veículo são serializadas.
         """
-        # Busca no repositório externo
-        vehicles_data = self._repository.find_all()
+        vehicle_data = await self._repository.find_by_id_for_sale(vehicle_id)
+        
+        if not vehicle_data:
+            return None, False
+        
+        return Vehicle.from_row(vehicle_data), vehicle_data['sale_id'] is not None
+    
+    async def find_all_vehicles(self, limit: int = 100, offset: int = 0) -> VehicleBatch:
+        """
+        Busca uma página de veículos convertendo Repository -> VehicleBatch (colunas)
+        """
+        # Busca no repositório externo (uma única consulta paginada)
+        vehicles_data = await self._repository.find_all(limit=limit, offset=offset)
         
-        # Converte lista de dados para lista de Entities
-        return [self._dict_to_entity(data) for data in vehicles_data]
+        # Listagem somente leitura: monta as colunas direto, sem uma Entity por linha
+        return VehicleBatch(vehicles_data)
     
-    def find_available_vehicles_ordered_by_price(self) -> List[Vehicle]:
+    async def find_available_vehicles_ordered_by_price(self, limit: int = 100, offset: int = 0) -> VehicleBatch:
         """
-        Busca veículos disponíveis ordenados por preço
+        Busca uma página de veículos disponíveis ordenados por preço (VehicleBatch em colunas)
         """
-        vehicles_data = self._repository.find_available_ordered_by_price()
-        return [self._dict_to_entity(data) for data in vehicles_data]
+        vehicles_data = await self._repository.find_available_ordered_by_price(limit=limit, offset=offset)
+        return VehicleBatch(vehicles_data)
     
-    def find_sold_vehicles_ordered_by_price(self) -> List[Vehicle]:
+    async def find_sold_vehicles_ordered_by_price(self, limit: int = 100, offset: int = 0) -> VehicleBatch:
         """
-        Busca veículos vendidos ordenados por preço
+        Busca uma página de veículos vendidos ordenados por preço (VehicleBatch em colunas)
         """
-        vehicles_data = self._repository.find_sold_ordered_by_price()
-        return [self._dict_to_entity(data) for data in vehicles_data]
+        vehicles_data = await self._repository.find_sold_ordered_by_price(limit=limit, offset=offset)
+        return VehicleBatch(vehicles_data)
     
-    def update_vehicle(self, vehicle: Vehicle) -> Vehicle:
+    async def update_vehicle(self, vehicle: Vehicle) -> Vehicle:
         """
         Atualiza um veículo convertendo Entity -> DTO -> Repository -> Entity
         """
@@ -122,45 +143,20 @@ class VehicleGateway:
         vehicle_data = self._entity_to_dict(vehicle)
         
         # Atualiza no repositório externo
-        updated_data = self._repository.update(vehicle.id, vehicle_data)
+        updated_data = await self._repository.update(vehicle.id, vehicle_data)
         
-        # Converte dados atualizados de volta para Entity
-        return self._dict_to_entity(updated_data)
+        # Dados acabaram de ser validados pela Entity: reconstrói sem revalidar
+        return Vehicle.from_row(updated_data)
     
-    def delete_vehicle(self, vehicle_id: int) -> bool:
+    async def delete_vehicle(self, vehicle_id: int) -> bool:
         """
         Remove um veículo do repositório
         """
-        return self._repository.delete(vehicle_id)
+        return await self._repository.delete(vehicle_id)
     
     def _entity_to_dict(self, vehicle: Vehicle) -> dict:
         """
         Converte Entity Vehicle para dicionário (DTO para mundo externo)
+        Price segue Decimal para a coluna DECIMAL; status Enum -> string
         """
-        return {
-            'id': vehicle.id,
-            'brand': vehicle.brand,
-            'model': vehicle.model,
-            'year': vehicle.year,
-            'price': float(vehicle.price),  # Decimal -> float para persistência
-            'color': vehicle.color,
-            'status': vehicle.status.value,  # Enum -> string
-            'created_at': vehicle.created_at,
-            'updated_at': vehicle.updated_at
-        }
-    
-    def _dict_to_entity(self, data: dict) -> Vehicle:
-        """
-        Converte dicionário (dados do repositório) para Entity Vehicle
-        """
-        return Vehicle(
-            vehicle_id=data.get('id'),
-            brand=data['brand'],
-            model=data['model'],
-            year=data['year'],
-            price=Decimal(str(data['price'])),  # float -> Decimal
-            color=data['color'],
-            status=VehicleStatus(data['status'].lower()),  # string -> Enum (lowercase)
-            created_at=data.get('created_at'),
-            updated_at=data.get('updated_at')
-        )
+        return vehicle.to_row()
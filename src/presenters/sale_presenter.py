@@ -2,10 +2,94 @@
 Presenters de Vendas - Formatação de saída para o mundo externo
 Converte Entities para DTOs/Responses para diferentes tipos de saída
 """
+from functools import lru_cache
 from typing import List, Dict, Any
 from decimal import Decimal
 
-from ..entities.sale import Sale
+from ..entities.sale import PAYMENT_STATUS_STR, PaymentStatus, Sale
+
+# Pontuação aceita na entrada do CPF, removida numa única passada
+_CPF_PUNCTUATION = str.maketrans('', '', '.-/ ')
+
+# Troca separadores de milhar/decimal (1,234.56 -> 1.234,56) numa única passada
+_BR_MONEY = str.maketrans(',.', '.,')
+
+# Rótulo em português de cada status de pagamento (to_display_string)
+_PAYMENT_STATUS_PT = {
+    PaymentStatus.PENDING: 'Pendente',
+    PaymentStatus.APPROVED: 'Aprovado',
+    PaymentStatus.REJECTED: 'Rejeitado',
+}
+
+
+@lru_cache(maxsize=4096)
+def _mask_cpf(cpf: str) -> str:
+    """
+    Mascara o CPF para exibição pública
+    Exemplo: 123.456.789-00 -> 123.***.**9-00
+    
+    Cacheado: o mesmo cliente aparece em várias vendas das listagens.
+    """
+    if not cpf:
+        return cpf
+    
+    # Remove a pontuação usual de uma vez; sobra qualquer outro caractere
+    digits = cpf.translate(_CPF_PUNCTUATION)
+    if not digits.isdigit():
+        digits = ''.join(filter(str.isdigit, digits))
+    
+    if len(digits) != 11:
+        return cpf
+    
+    return digits[:3] + '.***.**' + digits[8] + '-' + digits[9:]
+
+
+def _to_sale_dict(sale: Sale) -> Dict[str, Any]:
+    """
+    Converte Sale Entity para dicionário (formato API)
+    
+    Datas seguem como datetime: a serialização JSON da resposta
+    (response_model, via Pydantic) já as escreve em ISO 8601. O valor continua
+    float para manter o número JSON do contrato (Decimal sairia string).
+    """
+    return {
+        'id': sale.id,
+        'vehicle_id': sale.vehicle_id,
+        'customer_cpf': sale.customer_cpf,
+        'sale_date': sale.sale_date,
+        'amount': sale.amount_float,
+        'payment_status': PAYMENT_STATUS_STR[sale.payment_status],
+        'created_at': sale.created_at,
+        'updated_at': sale.updated_at
+    }
+
+
+def _to_sale_summary_dict(sale: Sale) -> Dict[str, Any]:
+    """
+    Converte Sale Entity para resumo (formato compacto)
+    """
+    return {
+        'id': sale.id,
+        'vehicle_id': sale.vehicle_id,
+        'customer_cpf': _mask_cpf(sale.customer_cpf),
+        'amount': sale.amount_float,
+        'payment_status': PAYMENT_STATUS_STR[sale.payment_status],
+        'sale_date': sale.sale_date
+    }
+
+
+def _to_sale_public_dict(sale: Sale) -> Dict[str, Any]:
+    """
+    Converte Sale Entity para formato público (CPF mascarado)
+    """
+    return {
+        'id': sale.id,
+        'vehicle_id': sale.vehicle_id,
+        'customer_cpf': _mask_cpf(sale.customer_cpf),
+        'sale_date': sale.sale_date,
+        'amount': sale.amount_float,
+        'payment_status': PAYMENT_STATUS_STR[sale.payment_status]
+    }
 
 
 class SalePresenter:
@@ -17,72 +101,36 @@ class SalePresenter:
     - Formatação para API REST (JSON)
     - Formatação para webhooks
     - Mascaramento de dados sensíveis quando necessário
+    
+    As conversões por venda são funções do módulo; os métodos abaixo só as
+    expõem, e as listas usam map() direto sobre elas.
     """
     
-    @staticmethod
-    def to_dict(sale: Sale) -> Dict[str, Any]:
-        """
-        Converte Sale Entity para dicionário (formato API)
-        """
-        return {
-            'id': sale.id,
-            'vehicle_id': sale.vehicle_id,
-            'customer_cpf': sale.customer_cpf,
-            'sale_date': sale.sale_date.isoformat(),
-            'amount': float(sale.amount),
-            'payment_status': sale.payment_status.value,
-            'created_at': sale.created_at.isoformat() if sale.created_at else None,
-            'updated_at': sale.updated_at.isoformat() if sale.updated_at else None
-        }
+    to_dict = staticmethod(_to_sale_dict)
+    to_summary_dict = staticmethod(_to_sale_summary_dict)
+    to_public_dict = staticmethod(_to_sale_public_dict)
+    _mask_cpf = staticmethod(_mask_cpf)
     
     @staticmethod
     def to_list(sales: List[Sale]) -> List[Dict[str, Any]]:
         """
         Converte lista de Sale Entities para lista de dicionários
         """
-        return [SalePresenter.to_dict(sale) for sale in sales]
-    
-    @staticmethod
-    def to_summary_dict(sale: Sale) -> Dict[str, Any]:
-        """
-        Converte Sale Entity para resumo (formato compacto)
-        """
-        return {
-            'id': sale.id,
-            'vehicle_id': sale.vehicle_id,
-            'customer_cpf': SalePresenter._mask_cpf(sale.customer_cpf),
-            'amount': float(sale.amount),
-            'payment_status': sale.payment_status.value,
-            'sale_date': sale.sale_date.isoformat()
-        }
+        return list(map(_to_sale_dict, sales))
     
     @staticmethod
     def to_summary_list(sales: List[Sale]) -> List[Dict[str, Any]]:
         """
         Converte lista de Sale Entities para lista de resumos
         """
-        return [SalePresenter.to_summary_dict(sale) for sale in sales]
-    
-    @staticmethod
-    def to_public_dict(sale: Sale) -> Dict[str, Any]:
-        """
-        Converte Sale Entity para formato público (CPF mascarado)
-        """
-        return {
-            'id': sale.id,
-            'vehicle_id': sale.vehicle_id,
-            'customer_cpf': SalePresenter._mask_cpf(sale.customer_cpf),
-            'sale_date': sale.sale_date.isoformat(),
-            'amount': float(sale.amount),
-            'payment_status': sale.payment_status.value
-        }
+        return list(map(_to_sale_summary_dict, sales))
     
     @staticmethod
     def to_public_list(sales: List[Sale]) -> List[Dict[str, Any]]:
         """
         Converte lista de Sale Entities para formato público
         """
-        return [SalePresenter.to_public_dict(sale) for sale in sales]
+        return list(map(_to_sale_public_dict, sales))
     
     @staticmethod
     def to_create_response(sale: Sale) -> Dict[str, Any]:
@@ -91,7 +139,7 @@ class SalePresenter:
         """
         return {
             'message': 'Venda criada com sucesso',
-            'sale': SalePresenter.to_dict(sale),
+            'sale': _to_sale_dict(sale),
             'status': 'created'
         }
     
@@ -102,7 +150,7 @@ class SalePresenter:
         """
         return {
             'message': 'Status de pagamento atualizado com sucesso',
-            'sale': SalePresenter.to_dict(sale),
+            'sale': _to_sale_dict(sale),
             'status': 'updated'
         }
     
@@ -145,42 +193,23 @@ class SalePresenter:
     @staticmethod
     def to_payment_status_dict(sale: Sale) -> Dict[str, Any]:
         """
-        Formato específico para status de pagamento
+        Formato específico para status de pagamento (updated_at pode ser None)
         """
         return {
             'sale_id': sale.id,
-            'payment_status': sale.payment_status.value,
+            'payment_status': PAYMENT_STATUS_STR[sale.payment_status],
             'is_approved': sale.is_payment_approved(),
             'is_pending': sale.is_payment_pending(),
             'is_rejected': sale.is_payment_rejected(),
-            'updated_at': sale.updated_at.isoformat()
+            'updated_at': sale.updated_at
         }
     
-    @staticmethod
-    def _mask_cpf(cpf: str) -> str:
-        """
-        Mascara o CPF para exibição pública
-        Exemplo: 123.456.789-00 -> 123.***.**9-00
-        """
-        if not cpf or len(cpf) < 11:
-            return cpf
-        
-        # Remove formatação
-        numbers_only = ''.join(filter(str.isdigit, cpf))
-        
-        if len(numbers_only) != 11:
-            return cpf
-        
-        # Aplica máscara
-        masked = f"{numbers_only[:3]}.***.**{numbers_only[8]}-{numbers_only[9:]}"
-        return masked
-    
     @staticmethod
     def format_amount(amount: Decimal) -> str:
         """
         Formata valor da venda para exibição em formato brasileiro
         """
-        return f"R$ {amount:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+        return "R$ " + format(amount, ',.2f').translate(_BR_MONEY)
     
     @staticmethod
     def to_display_string(sale: Sale) -> str:
@@ -188,11 +217,7 @@ class SalePresenter:
         Converte Sale Entity para string de exibição amigável
         """
         amount_formatted = SalePresenter.format_amount(sale.amount)
-        cpf_masked = SalePresenter._mask_cpf(sale.customer_cpf)
-        status_text = {
-            'pending': 'Pendente',
-            'approved': 'Aprovado',
-            'rejected': 'Rejeitado'
-        }.get(sale.payment_status.value, sale.payment_status.value)
+        cpf_masked = _mask_cpf(sale.customer_cpf)
+        status_text = _PAYMENT_STATUS_PT[sale.payment_status]
         
         return f"Venda {sale.id} - Veículo {sale.vehicle_id} - {cpf_masked} - {amount_formatted} ({status_text})"
@@ -2,10 +2,70 @@
 Presenters de Veículos - Formatação de saída para o mundo externo
 Converte Entities para DTOs/Responses para diferentes tipos de saída
 """
-from typing import List, Dict, Any
+from typing import Iterable, List, Dict, Any
 from decimal import Decimal
 
-from ..entities.vehicle import Vehicle
+import orjson
+
+from ..entities.vehicle import VEHICLE_STATUS_STR, Vehicle, VehicleBatch, VehicleStatus
+
+# Troca separadores de milhar/decimal (1,234.56 -> 1.234,56) numa única passada
+_BR_MONEY = str.maketrans(',.', '.,')
+
+# Rótulo em português de cada status de veículo (to_display_string)
+_VEHICLE_STATUS_PT = {
+    VehicleStatus.AVAILABLE: 'Disponível',
+    VehicleStatus.SOLD: 'Vendido',
+}
+
+
+def _to_vehicle_dict(vehicle: Vehicle) -> Dict[str, Any]:
+    """
+    Converte Vehicle Entity para dicionário (formato API)
+    
+    Datas seguem como datetime: a serialização JSON da resposta
+    (response_model, via Pydantic) já as escreve em ISO 8601.
+    """
+    return {
+        'id': vehicle.id,
+        'brand': vehicle.brand,
+        'model': vehicle.model,
+        'year': vehicle.year,
+        'price': vehicle.price_float,
+        'color': vehicle.color,
+        'status': VEHICLE_STATUS_STR[vehicle.status],
+        'created_at': vehicle.created_at,
+        'updated_at': vehicle.updated_at
+    }
+
+
+def _to_vehicle_summary_dict(vehicle: Vehicle) -> Dict[str, Any]:
+    """
+    Converte Vehicle Entity para resumo (formato compacto)
+    """
+    return {
+        'id': vehicle.id,
+        'brand': vehicle.brand,
+        'model': vehicle.model,
+        'year': vehicle.year,
+        'price': vehicle.price_float,
+        'status': VEHICLE_STATUS_STR[vehicle.status]
+    }
+
+
+def _to_vehicle_public_dict(vehicle: Vehicle) -> Dict[str, Any]:
+    """
+    Converte Vehicle Entity para formato público (sem dados internos)
+    """
+    return {
+        'id': vehicle.id,
+        'brand': vehicle.brand,
+        'model': vehicle.model,
+        'year': vehicle.year,
+        'price': vehicle.price_float,
+        'color': vehicle.color,
+        'status': VEHICLE_STATUS_STR[vehicle.status]
+    }
 
 
 class VehiclePresenter:
@@ -17,74 +77,98 @@ class VehiclePresenter:
     - Formatação para API REST (JSON)
     - Formatação para relatórios
     - Mascaramento de dados sensíveis quando necessário
+    
+    As conversões por veículo são funções do módulo; os métodos abaixo só as
+    expõem, e as listas usam map() direto sobre elas.
     """
     
-    @staticmethod
-    def to_dict(vehicle: Vehicle) -> Dict[str, Any]:
-        """
-        Converte Vehicle Entity para dicionário (formato API)
-        """
-        return {
-            'id': vehicle.id,
-            'brand': vehicle.brand,
-            'model': vehicle.model,
-            'year': vehicle.year,
-            'price': float(vehicle.price),
-            'color': vehicle.color,
-            'status': vehicle.status.value,
-            'created_at': vehicle.created_at.isoformat() if vehicle.created_at else None,
-            'updated_at': vehicle.updated_at.isoformat() if vehicle.updated_at else None
-        }
+    to_dict = staticmethod(_to_vehicle_dict)
+    to_summary_dict = staticmethod(_to_vehicle_summary_dict)
+    to_public_dict = staticmethod(_to_vehicle_public_dict)
     
     @staticmethod
-    def to_list(vehicles: List[Vehicle]) -> List[Dict[str, Any]]:
+    def to_list(vehicles: Iterable[Vehicle]) -> List[Dict[str, Any]]:
         """
         Converte lista de Vehicle Entities para lista de dicionários
         """
-        return [VehiclePresenter.to_dict(vehicle) for vehicle in vehicles]
+        return list(map(_to_vehicle_dict, vehicles))
     
     @staticmethod
-    def to_summary_dict(vehicle: Vehicle) -> Dict[str, Any]:
-        """
-        Converte Vehicle Entity para resumo (formato compacto)
-        """
-        return {
-            'id': vehicle.id,
-            'brand': vehicle.brand,
-            'model': vehicle.model,
-            'year': vehicle.year,
-            'price': float(vehicle.price),
-            'status': vehicle.status.value
-        }
+    def batch_to_list(batch: VehicleBatch) -> List[Dict[str, Any]]:
+        """
+        Converte um VehicleBatch (colunas) para lista de dicionários, no mesmo formato de to_dict
+        """
+        return [
+            {
+                'id': vehicle_id,
+                'brand': brand,
+                'model': model,
+                'year': year,
+                'price': price,
+                'color': color,
+                'status': status,
+                'created_at': created_at,
+                'updated_at': updated_at
+            }
+            for vehicle_id, brand, model, year, price, color, status, created_at, updated_at in zip(
+                batch.ids, batch.brands, batch.models, batch.years, batch.prices,
+                batch.colors, batch.statuses, batch.created_ats, batch.updated_ats
+            )
+        ]
     
     @staticmethod
-    def to_summary_list(vehicles: List[Vehicle]) -> List[Dict[str, Any]]:
-        """
-        Converte lista de Vehicle Entities para lista de resumos
-        """
-        return [VehiclePresenter.to_summary_dict(vehicle) for vehicle in vehicles]
+    def batch_to_public_list(batch: VehicleBatch) -> List[Dict[str, Any]]:
+        """
+        Converte um VehicleBatch (colunas) para lista no formato público, o mesmo de to_public_dict
+        """
+        return [
+            {
+                'id': vehicle_id,
+                'brand': brand,
+                'model': model,
+                'year': year,
+                'price': price,
+                'color': color,
+                'status': status
+            }
+            for vehicle_id, brand, model, year, price, color, status in zip(
+                batch.ids, batch.brands, batch.models, batch.years, batch.prices,
+                batch.colors, batch.statuses
+            )
+        ]
     
     @staticmethod
-    def to_public_dict(vehicle: Vehicle) -> Dict[str, Any]:
-        """
-        Converte Vehicle Entity para formato público (sem dados internos)
-        """
-        return {
-            'id': vehicle.id,
-            'brand': vehicle.brand,
-            'model': vehicle.model,
-            'year': vehicle.year,
-            'price': float(vehicle.price),
-            'color': vehicle.color,
-            'status': vehicle.status.value
-        }
+    def batch_to_json(batch: VehicleBatch, limit: int, offset: int) -> bytes:
+        """
+        Serializa a resposta de listagem de um VehicleBatch direto para JSON (bytes)
+        
+        Sem passar pelo encoder do FastAPI: o orjson escreve datetimes naive no
+        mesmo formato de isoformat()
+        """
+        return orjson.dumps({
+            'vehicles': VehiclePresenter.batch_to_list(batch),
+            'total': len(batch),
+            'limit': limit,
+            'offset': offset,
+            'status': 'success'
+        })
     
     @staticmethod
-    def to_public_list(vehicles: List[Vehicle]) -> List[Dict[str, Any]]:
-        """
-        Converte lista de Vehicle Entities para formato público
-        """
-        return [VehiclePresenter.to_public_dict(vehicle) for vehicle in vehicles]
+    def batch_to_public_json(batch: VehicleBatch, limit: int, offset: int, filter_name: str) -> bytes:
+        """
+        Serializa a resposta de listagem por status de um VehicleBatch direto para JSON (bytes)
+        
+        Mesmo corpo que o FastAPI geraria a partir do dicionário, sem passar pelo
+        response_model nem pelo encoder dele
+        """
+        return orjson.dumps({
+            'vehicles': VehiclePresenter.batch_to_public_list(batch),
+            'total': len(batch),
+            'limit': limit,
+            'offset': offset,
+            'status': 'success',
+            'filter': filter_name
+        })
     
     @staticmethod
     def to_create_response(vehicle: Vehicle) -> Dict[str, Any]:
@@ -93,7 +177,7 @@ class VehiclePresenter:
         """
         return {
             'message': 'Veículo criado com sucesso',
-            'vehicle': VehiclePresenter.to_dict(vehicle),
+            'vehicle': _to_vehicle_dict(vehicle),
             'status': 'created'
         }
     
@@ -104,7 +188,7 @@ class VehiclePresenter:
         """
         return {
             'message': 'Veículo atualizado com sucesso',
-            'vehicle': VehiclePresenter.to_dict(vehicle),
+            'vehicle': _to_vehicle_dict(vehicle),
             'status': 'updated'
         }
     
@@ -149,7 +233,7 @@ class VehiclePresenter:
         """
         Formata preço para exibição em formato brasileiro
         """
-        return f"R$ {price:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+        return "R$ " + format(price, ',.2f').translate(_BR_MONEY)
     
     @staticmethod
     def to_display_string(vehicle: Vehicle) -> str:
@@ -157,5 +241,5 @@ class VehiclePresenter:
         Converte Vehicle Entity para string de exibição amigável
         """
         price_formatted = VehiclePresenter.format_price(vehicle.price)
-        status_text = "Disponível" if vehicle.is_available() else "Vendido"
+        status_text = _VEHICLE_STATUS_PT[vehicle.status]
         return f"{vehicle.brand} {vehicle.model} {vehicle.year} - {vehicle.color} - {price_formatted} ({status_text})"
@@ -6,11 +6,17 @@ from typing import List, Optional
 from decimal import Decimal
 from datetime import datetime
 
-from ..entities.sale import Sale, PaymentStatus
+from ..entities.sale import PAYMENT_STATUS_STR, Sale, PaymentStatus
 from ..entities.vehicle import Vehicle
 from ..gateways.sale_gateway import SaleGateway
 from ..gateways.vehicle_gateway import VehicleGateway
 
+# Status que o webhook pode aplicar
+_PAYMENT_UPDATE_STATUSES = frozenset({'approved', 'rejected'})
+
+# Campos obrigatórios do payload do webhook
+_REQUIRED_WEBHOOK_FIELDS = frozenset({'sale_id', 'status'})
+
 
 class CreateSaleUseCase:
     """Use Case para criar uma nova venda"""
@@ -19,7 +25,7 @@ class CreateSaleUseCase:
         self._sale_gateway = sale_gateway
         self._vehicle_gateway = vehicle_gateway
     
-    def execute(self, vehicle_id: int, customer_cpf: str, amount: Decimal) -> Sale:
+    async def execute(self, vehicle_id: int, customer_cpf: str, amount: Decimal) -> Sale:
         """
         Executa a criação de uma nova venda
         
@@ -30,8 +36,8 @@ class CreateSaleUseCase:
         - Veículo é marcado como vendido
         - Venda criada com status PENDING
         """
-        # Verifica se veículo existe e está disponível
-        vehicle = self._vehicle_gateway.find_vehicle_by_id(vehicle_id)
+        # Veículo e venda existente numa única consulta (linha travada até o commit)
+        vehicle, has_sale = await self._vehicle_gateway.find_vehicle_for_sale(vehicle_id)
         if not vehicle:
             raise ValueError(f"Veículo com ID {vehicle_id} não encontrado")
         
@@ -39,8 +45,7 @@ class CreateSaleUseCase:
             raise ValueError("Veículo não está disponível para venda")
         
         # Verifica se já existe venda para o veículo
-        existing_sale = self._sale_gateway.find_sale_by_vehicle_id(vehicle_id)
-        if existing_sale:
+        if has_sale:
             raise ValueError("Veículo já possui uma venda registrada")
         
         # Cria a Entity Sale (validações automáticas)
@@ -53,11 +58,11 @@ class CreateSaleUseCase:
         )
         
         # Salva a venda
-        saved_sale = self._sale_gateway.save_sale(sale)
+        saved_sale = await self._sale_gateway.save_sale(sale)
         
         # Marca o veículo como vendido
         vehicle.mark_as_sold()
-        self._vehicle_gateway.update_vehicle(vehicle)
+        await self._vehicle_gateway.update_vehicle(vehicle)
         
         return saved_sale
 
@@ -68,7 +73,7 @@ class FindSaleByIdUseCase:
     def __init__(self, sale_gateway: SaleGateway):
         self._sale_gateway = sale_gateway
     
-    def execute(self, sale_id: int) -> Optional[Sale]:
+    async def execute(self, sale_id: int) -> Optional[Sale]:
         """
         Executa a busca de uma venda por ID
         
@@ -79,7 +84,7 @@ class FindSaleByIdUseCase:
         if not isinstance(sale_id, int) or sale_id <= 0:
             raise ValueError("ID da venda deve ser um número positivo")
         
-        return self._sale_gateway.find_sale_by_id(sale_id)
+        return await self._sale_gateway.find_sale_by_id(sale_id)
 
 
 class FindSaleByVehicleIdUseCase:
@@ -88,7 +93,7 @@ class FindSaleByVehicleIdUseCase:
     def __init__(self, sale_gateway: SaleGateway):
         self._sale_gateway = sale_gateway
     
-    def execute(self, vehicle_id: int) -> Optional[Sale]:
+    async def execute(self, vehicle_id: int) -> Optional[Sale]:
         """
         Executa a busca de uma venda por ID do veículo
         
@@ -99,7 +104,7 @@ class FindSaleByVehicleIdUseCase:
         if not isinstance(vehicle_id, int) or vehicle_id <= 0:
             raise ValueError("ID do veículo deve ser um número positivo")
         
-        return self._sale_gateway.find_sale_by_vehicle_id(vehicle_id)
+        return await self._sale_gateway.find_sale_by_vehicle_id(vehicle_id)
 
 
 class ListAllSalesUseCase:
@@ -108,14 +113,14 @@ class ListAllSalesUseCase:
     def __init__(self, sale_gateway: SaleGateway):
         self._sale_gateway = sale_gateway
     
-    def execute(self) -> List[Sale]:
+    async def execute(self, limit: int = 100, offset: int = 0) -> List[Sale]:
         """
-        Executa a listagem de todas as vendas
+        Executa a listagem paginada de todas as vendas
         
         Regras de negócio:
         - Retorna lista vazia se não houver vendas
         """
-        return self._sale_gateway.find_all_sales()
+        return await self._sale_gateway.find_all_sales(limit=limit, offset=offset)
 
 
 class UpdatePaymentStatusUseCase:
@@ -124,7 +129,7 @@ class UpdatePaymentStatusUseCase:
     def __init__(self, sale_gateway: SaleGateway):
         self._sale_gateway = sale_gateway
     
-    def execute(self, sale_id: int, payment_status: str) -> Sale:
+    async def execute(self, sale_id: int, payment_status: str) -> Sale:
         """
         Executa a atualização do status de pagamento
         
@@ -134,24 +139,29 @@ class UpdatePaymentStatusUseCase:
         - Operação deve ser idempotente
         - Transições de status devem ser respeitadas
         """
+        # Valida e normaliza o status (antes de ir ao banco)
+        payment_status = payment_status.lower().strip()
+        if payment_status not in _PAYMENT_UPDATE_STATUSES:
+            raise ValueError("Status de pagamento deve ser 'approved' ou 'rejected'")
+        
         # Busca a venda
-        sale = self._sale_gateway.find_sale_by_id(sale_id)
+        sale = await self._sale_gateway.find_sale_by_id(sale_id)
         if not sale:
             raise ValueError(f"Venda com ID {sale_id} não encontrada")
         
-        # Valida e normaliza o status
-        payment_status = payment_status.lower().strip()
-        if payment_status not in ['approved', 'rejected']:
-            raise ValueError("Status de pagamento deve ser 'approved' ou 'rejected'")
+        # Webhook repetido: status já aplicado, nada a mudar nem gravar
+        if PAYMENT_STATUS_STR[sale.payment_status] == payment_status:
+            return sale
         
         # Aplica a mudança de status (com validações da Entity)
+        previous_status = sale.payment_status
         if payment_status == 'approved':
             sale.approve_payment()
         else:
             sale.reject_payment()
         
-        # Persiste a alteração
-        return self._sale_gateway.update_sale(sale)
+        # Persiste a alteração (escrita condicional ao status lido)
+        return await self._sale_gateway.update_sale_payment_status(sale, previous_status)
 
 
 class ProcessPaymentWebhookUseCase:
@@ -160,7 +170,7 @@ class ProcessPaymentWebhookUseCase:
     def __init__(self, sale_gateway: SaleGateway):
         self._sale_gateway = sale_gateway
     
-    def execute(self, payment_data: dict) -> dict:
+    async def execute(self, payment_data: dict) -> dict:
         """
         Executa o processamento de webhook de pagamento
         
@@ -170,11 +180,10 @@ class ProcessPaymentWebhookUseCase:
         - Atualiza status conforme necessário
         - Retorna resultado da operação
         """
-        # Valida dados obrigatórios
-        required_fields = ['sale_id', 'status']
-        for field in required_fields:
-            if field not in payment_data:
-                raise ValueError(f"Campo obrigatório ausente: {field}")
+        # Valida dados obrigatórios (uma diferença de conjuntos sobre as chaves)
+        missing = _REQUIRED_WEBHOOK_FIELDS - payment_data.keys()
+        if missing:
+            raise ValueError(f"Campo obrigatório ausente: {', '.join(sorted(missing))}")
         
         sale_id = payment_data['sale_id']
         status = payment_data['status']
@@ -185,7 +194,7 @@ class ProcessPaymentWebhookUseCase:
         
         # Processa a atualização
         try:
-            updated_sale = UpdatePaymentStatusUseCase(self._sale_gateway).execute(
+            updated_sale = await UpdatePaymentStatusUseCase(self._sale_gateway).execute(
                 sale_id=sale_id,
                 payment_status=status
             )
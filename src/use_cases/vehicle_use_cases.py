@@ -2,10 +2,10 @@
 Use Cases de Veículos - Camada de interação com regras de negócio
 Orquestra as operações entre Entities e Gateways
 """
-from typing import List, Optional
+from typing import Optional
 from decimal import Decimal
 
-from ..entities.vehicle import Vehicle, VehicleStatus
+from ..entities.vehicle import Vehicle, VehicleBatch, VehicleStatus
 from ..gateways.vehicle_gateway import VehicleGateway
 
 
@@ -15,7 +15,7 @@ class CreateVehicleUseCase:
     def __init__(self, vehicle_gateway: VehicleGateway):
         self._vehicle_gateway = vehicle_gateway
     
-    def execute(self, brand: str, model: str, year: int, price: Decimal, color: str) -> Vehicle:
+    async def execute(self, brand: str, model: str, year: int, price: Decimal, color: str) -> Vehicle:
         """
         Executa a criação de um novo veículo
         
@@ -34,7 +34,7 @@ class CreateVehicleUseCase:
         )
         
         # Persiste através do Gateway
-        return self._vehicle_gateway.save_vehicle(vehicle)
+        return await self._vehicle_gateway.save_vehicle(vehicle)
 
 
 class FindVehicleByIdUseCase:
@@ -43,7 +43,7 @@ class FindVehicleByIdUseCase:
     def __init__(self, vehicle_gateway: VehicleGateway):
         self._vehicle_gateway = vehicle_gateway
     
-    def execute(self, vehicle_id: int) -> Optional[Vehicle]:
+    async def execute(self, vehicle_id: int) -> Optional[Vehicle]:
         """
         Executa a busca de um veículo por ID
         
@@ -54,7 +54,7 @@ class FindVehicleByIdUseCase:
         if not isinstance(vehicle_id, int) or vehicle_id <= 0:
             raise ValueError("ID do veículo deve ser um número positivo")
         
-        return self._vehicle_gateway.find_vehicle_by_id(vehicle_id)
+        return await self._vehicle_gateway.find_vehicle_by_id(vehicle_id)
 
 
 class ListAllVehiclesUseCase:
@@ -63,14 +63,14 @@ class ListAllVehiclesUseCase:
     def __init__(self, vehicle_gateway: VehicleGateway):
         self._vehicle_gateway = vehicle_gateway
     
-    def execute(self) -> List[Vehicle]:
+    async def execute(self, limit: int = 100, offset: int = 0) -> VehicleBatch:
         """
-        Executa a listagem de todos os veículos
+        Executa a listagem paginada de todos os veículos
         
         Regras de negócio:
         - Retorna lista vazia se não houver veículos
         """
-        return self._vehicle_gateway.find_all_vehicles()
+        return await self._vehicle_gateway.find_all_vehicles(limit=limit, offset=offset)
 
 
 class ListAvailableVehiclesUseCase:
@@ -79,15 +79,15 @@ class ListAvailableVehiclesUseCase:
     def __init__(self, vehicle_gateway: VehicleGateway):
         self._vehicle_gateway = vehicle_gateway
     
-    def execute(self) -> List[Vehicle]:
+    async def execute(self, limit: int = 100, offset: int = 0) -> VehicleBatch:
         """
-        Executa a listagem de veículos disponíveis ordenados por preço
+        Executa a listagem paginada de veículos disponíveis ordenados por preço
         
         Regras de negócio:
         - Apenas veículos com status AVAILABLE
         - Ordenados por preço crescente
         """
-        return self._vehicle_gateway.find_available_vehicles_ordered_by_price()
+        return await self._vehicle_gateway.find_available_vehicles_ordered_by_price(limit=limit, offset=offset)
 
 
 class ListSoldVehiclesUseCase:
@@ -96,15 +96,15 @@ class ListSoldVehiclesUseCase:
     def __init__(self, vehicle_gateway: VehicleGateway):
         self._vehicle_gateway = vehicle_gateway
     
-    def execute(self) -> List[Vehicle]:
+    async def execute(self, limit: int = 100, offset: int = 0) -> VehicleBatch:
         """
-        Executa a listagem de veículos vendidos ordenados por preço
+        Executa a listagem paginada de veículos vendidos ordenados por preço
         
         Regras de negócio:
         - Apenas veículos com status SOLD
         - Ordenados por preço crescente
         """
-        return self._vehicle_gateway.find_sold_vehicles_ordered_by_price()
+        return await self._vehicle_gateway.find_sold_vehicles_ordered_by_price(limit=limit, offset=offset)
 
 
 class UpdateVehicleUseCase:
@@ -113,7 +113,7 @@ class UpdateVehicleUseCase:
     def __init__(self, vehicle_gateway: VehicleGateway):
         self._vehicle_gateway = vehicle_gateway
     
-    def execute(self, vehicle_id: int, brand: str = None, model: str = None, 
+    async def execute(self, vehicle_id: int, brand: str = None, model: str = None, 
                 year: int = None, price: Decimal = None, color: str = None) -> Vehicle:
         """
         Executa a atualização de um veículo
@@ -123,20 +123,17 @@ class UpdateVehicleUseCase:
         - Apenas veículos disponíveis podem ser alterados
         - Validações feitas pela Entity
         """
-        # Busca o veículo atual
-        vehicle = self._vehicle_gateway.find_vehicle_by_id(vehicle_id)
+        # Busca o veículo atual travando a linha: uma venda simultânea espera a gravação
+        vehicle = await self._vehicle_gateway.find_vehicle_by_id(vehicle_id, for_update=True)
         if not vehicle:
             raise ValueError(f"Veículo com ID {vehicle_id} não encontrado")
         
-        # Atualiza os dados (com validações da Entity)
-        if brand or model or year or color:
-            vehicle.update_details(brand=brand, model=model, year=year, color=color)
-        
-        if price is not None:
-            vehicle.update_price(price)
+        # Atualiza os dados numa única chamada (com validações da Entity)
+        if brand or model or year or color or price is not None:
+            vehicle.update_details(brand=brand, model=model, year=year, color=color, price=price)
         
         # Persiste as alterações
-        return self._vehicle_gateway.update_vehicle(vehicle)
+        return await self._vehicle_gateway.update_vehicle(vehicle)
 
 
 class DeleteVehicleUseCase:
@@ -145,7 +142,7 @@ class DeleteVehicleUseCase:
     def __init__(self, vehicle_gateway: VehicleGateway):
         self._vehicle_gateway = vehicle_gateway
     
-    def execute(self, vehicle_id: int) -> bool:
+    async def execute(self, vehicle_id: int) -> bool:
         """
         Executa a exclusão de um veículo
         
@@ -154,7 +151,7 @@ class DeleteVehicleUseCase:
         - Apenas veículos disponíveis podem ser deletados
         """
         # Busca o veículo
-        vehicle = self._vehicle_gateway.find_vehicle_by_id(vehicle_id)
+        vehicle = await self._vehicle_gateway.find_vehicle_by_id(vehicle_id)
         if not vehicle:
             raise ValueError(f"Veículo com ID {vehicle_id} não encontrado")
         
@@ -163,7 +160,7 @@ class DeleteVehicleUseCase:
             raise ValueError("Não é possível deletar veículo vendido")
         
         # Deleta através do Gateway
-        return self._vehicle_gateway.delete_vehicle(vehicle_id)
+        return await self._vehicle_gateway.delete_vehicle(vehicle_id)
 
 
 class MarkVehicleAsSoldUseCase:
@@ -172,7 +169,7 @@ class MarkVehicleAsSoldUseCase:
     def __init__(self, vehicle_gateway: VehicleGateway):
         self._vehicle_gateway = vehicle_gateway
     
-    def execute(self, vehicle_id: int) -> Vehicle:
+    async def execute(self, vehicle_id: int) -> Vehicle:
         """
         Executa a marcação de um veículo como vendido
         
@@ -180,8 +177,8 @@ class MarkVehicleAsSoldUseCase:
         - Veículo deve existir
         - Veículo deve estar disponível
         """
-        # Busca o veículo
-        vehicle = self._vehicle_gateway.find_vehicle_by_id(vehicle_id)
+        # Busca o veículo travando a linha até o commit
+        vehicle = await self._vehicle_gateway.find_vehicle_by_id(vehicle_id, for_update=True)
         if not vehicle:
             raise ValueError(f"Veículo com ID {vehicle_id} não encontrado")
         
@@ -189,4 +186,4 @@ class MarkVehicleAsSoldUseCase:
         vehicle.mark_as_sold()
         
         # Persiste a alteração
-        return self._vehicle_gateway.update_vehicle(vehicle)
+        return await self._vehicle_gateway.update_vehicle(vehicle)
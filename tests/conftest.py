@@ -0,0 +1,150 @@
+"""
+Repositórios em memória para os testes das camadas internas
+Implementam as interfaces dos Gateways sem banco: cada teste monta o cenário nas linhas
+"""
+import asyncio
+import inspect
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Mapping, Optional
+
+import pytest
+
+from src.gateways.sale_gateway import SaleRepositoryInterface
+from src.gateways.vehicle_gateway import VehicleRepositoryInterface
+
+# CPF válido (dígitos verificadores corretos)
+VALID_CPF = '529.982.247-25'
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """Roda os testes `async def` num event loop próprio, sem depender de plugin"""
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+    arguments = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+    asyncio.run(pyfuncitem.obj(**arguments))
+    return True
+
+
+class InMemoryVehicleRepository(VehicleRepositoryInterface):
+    """Veículos num dict; registra as leituras com trava para os testes conferirem"""
+
+    def __init__(self):
+        self.rows: Dict[int, dict] = {}
+        self.sale_ids: Dict[int, int] = {}
+        self.locked_reads: List[int] = []
+        self.fail_with: Optional[Exception] = None
+
+    def add(self, vehicle_id: int, price: str = '50000.00', status: str = 'available') -> dict:
+        now = datetime.now()
+        self.rows[vehicle_id] = {
+            'id': vehicle_id, 'brand': 'Toyota', 'model': 'Corolla', 'year': 2022,
+            'price': Decimal(price), 'color': 'Prata', 'status': status,
+            'created_at': now, 'updated_at': now
+        }
+        return self.rows[vehicle_id]
+
+    async def save(self, vehicle_data: dict) -> dict:
+        if self.fail_with:
+            raise self.fail_with
+        vehicle_id = max(self.rows, default=0) + 1
+        self.rows[vehicle_id] = {**vehicle_data, 'id': vehicle_id}
+        return dict(self.rows[vehicle_id])
+
+    async def find_by_id(self, vehicle_id: int, for_update: bool = False) -> Optional[Mapping[str, Any]]:
+        if self.fail_with:
+            raise self.fail_with
+        if for_update:
+            self.locked_reads.append(vehicle_id)
+        row = self.rows.get(vehicle_id)
+        return dict(row) if row else None
+
+    async def find_by_id_for_sale(self, vehicle_id: int) -> Optional[Mapping[str, Any]]:
+        self.locked_reads.append(vehicle_id)
+        row = self.rows.get(vehicle_id)
+        return {**row, 'sale_id': self.sale_ids.get(vehicle_id)} if row else None
+
+    async def find_all(self, limit: int = 100, offset: int = 0) -> List[Mapping[str, Any]]:
+        return [self.rows[k] for k in sorted(self.rows)][offset:offset + limit]
+
+    async def find_available_ordered_by_price(self, limit: int = 100, offset: int = 0) -> List[Mapping[str, Any]]:
+        return self._by_status('available')[offset:offset + limit]
+
+    async def find_sold_ordered_by_price(self, limit: int = 100, offset: int = 0) -> List[Mapping[str, Any]]:
+        return self._by_status('sold')[offset:offset + limit]
+
+    def _by_status(self, status: str) -> List[dict]:
+        rows = [row for row in self.rows.values() if row['status'] == status]
+        return sorted(rows, key=lambda row: (row['price'], row['id']))
+
+    async def update(self, vehicle_id: int, vehicle_data: dict) -> dict:
+        self.rows[vehicle_id] = {**self.rows[vehicle_id], **vehicle_data, 'id': vehicle_id}
+        return dict(self.rows[vehicle_id])
+
+    async def delete(self, vehicle_id: int) -> bool:
+        return self.rows.pop(vehicle_id, None) is not None
+
+
+class InMemorySaleRepository(SaleRepositoryInterface):
+    """Vendas num dict; update_payment_status tem a mesma semântica do UPDATE condicional"""
+
+    def __init__(self, vehicles: Optional[InMemoryVehicleRepository] = None):
+        self.rows: Dict[int, dict] = {}
+        self.status_writes = 0
+        self._vehicles = vehicles
+
+    def add(self, sale_id: int, payment_status: str = 'pending', sale_date: Optional[datetime] = None) -> dict:
+        now = datetime.now()
+        self.rows[sale_id] = {
+            'id': sale_id, 'vehicle_id': 1, 'customer_cpf': VALID_CPF,
+            'sale_date': sale_date or now, 'amount': Decimal('50000.00'),
+            'payment_status': payment_status, 'created_at': now, 'updated_at': now
+        }
+        return self.rows[sale_id]
+
+    async def save(self, sale_data: dict) -> dict:
+        sale_id = max(self.rows, default=0) + 1
+        self.rows[sale_id] = {**sale_data, 'id': sale_id}
+        if self._vehicles is not None:
+            self._vehicles.sale_ids[sale_data['vehicle_id']] = sale_id
+        return dict(self.rows[sale_id])
+
+    async def find_by_id(self, sale_id: int) -> Optional[Mapping[str, Any]]:
+        row = self.rows.get(sale_id)
+        return dict(row) if row else None
+
+    async def find_by_vehicle_id(self, vehicle_id: int) -> Optional[Mapping[str, Any]]:
+        return next((dict(row) for row in self.rows.values() if row['vehicle_id'] == vehicle_id), None)
+
+    async def find_all(self, limit: int = 100, offset: int = 0) -> List[Mapping[str, Any]]:
+        return [self.rows[k] for k in sorted(self.rows)][offset:offset + limit]
+
+    async def update(self, sale_id: int, sale_data: dict) -> dict:
+        self.rows[sale_id] = {**self.rows[sale_id], **sale_data, 'id': sale_id}
+        return dict(self.rows[sale_id])
+
+    async def update_payment_status(self, sale_id: int, expected_status: str,
+                                    payment_status: str, updated_at: datetime) -> bool:
+        self.status_writes += 1
+        row = self.rows.get(sale_id)
+        if row is None or row['payment_status'] != expected_status:
+            return False
+        row['payment_status'] = payment_status
+        row['updated_at'] = updated_at
+        return True
+
+
+@pytest.fixture
+def vehicle_repository() -> InMemoryVehicleRepository:
+    return InMemoryVehicleRepository()
+
+
+@pytest.fixture
+def sale_repository(vehicle_repository: InMemoryVehicleRepository) -> InMemorySaleRepository:
+    return InMemorySaleRepository(vehicle_repository)
+
+
+@pytest.fixture
+def valid_cpf() -> str:
+    return VALID_CPF
@@ -0,0 +1,51 @@
+"""Erros de domínio do controller e o status HTTP que cada um recebe"""
+import orjson
+import pytest
+
+from src.controllers.errors import DomainError, InternalError, NotFoundError, ValidationError
+from src.controllers.vehicle_controller import VehicleController
+from src.external.web.error_handlers import domain_error_handler
+
+
+@pytest.mark.parametrize('error, status_code', [
+    (ValidationError, 400),
+    (NotFoundError, 404),
+    (InternalError, 500),
+    (DomainError, 500),
+])
+async def test_domain_errors_map_to_status_codes(error, status_code):
+    detail = {'error': True, 'error_code': 'X', 'message': 'falhou', 'status': 'error'}
+
+    response = await domain_error_handler(None, error(detail))
+
+    assert response.status_code == status_code
+    assert orjson.loads(response.body) == {'detail': detail}
+
+
+async def test_invalid_vehicle_is_a_validation_error(vehicle_repository):
+    controller = VehicleController(vehicle_repository)
+
+    with pytest.raises(ValidationError) as raised:
+        await controller.create_vehicle(brand='T', model='Corolla', year=2022, price=1, color='Prata')
+    assert raised.value.detail['error_code'] == 'VALIDATION_ERROR'
+
+
+async def test_unexpected_create_failure_is_an_internal_error(vehicle_repository):
+    vehicle_repository.fail_with = RuntimeError('banco indisponível')
+    controller = VehicleController(vehicle_repository)
+
+    with pytest.raises(InternalError) as raised:
+        await controller.create_vehicle(brand='Toyota', model='Corolla', year=2022, price=1, color='Prata')
+    assert raised.value.detail['error_code'] == 'INTERNAL_ERROR'
+
+
+async def test_missing_vehicle_is_not_found(vehicle_repository):
+    with pytest.raises(NotFoundError):
+        await VehicleController(vehicle_repository).find_vehicle_by_id(42)
+
+
+async def test_unexpected_failure_is_an_internal_error(vehicle_repository):
+    vehicle_repository.fail_with = RuntimeError('banco indisponível')
+
+    with pytest.raises(InternalError):
+        await VehicleController(vehicle_repository).find_vehicle_by_id(1)
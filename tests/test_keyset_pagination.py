@@ -0,0 +1,81 @@
+"""
+Paginação por cursor (after_price, after_id) de GET /vehicles em app/routers/vehicles.py
+
+Roda em SQLite em memória: confere a ordem e o encadeamento das páginas, não a
+comparação de tuplas (price, id) nem as travas do MySQL
+"""
+import pytest
+from fastapi import Response
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.domain.models import Base, Vehicle, VehicleStatus
+from app.routers.vehicles import list_vehicles
+
+# Preços repetidos: o id desempata e o cursor não pode pular nem repetir linhas
+_PRICES = [30000.0, 10000.0, 20000.0, 10000.0, 20000.0, 10000.0, 50000.0, 20000.0, 40000.0, 30000.0, 10000.0]
+
+
+class _AsyncSessionAdapter:
+    """Expõe o execute() assíncrono que a rota usa sobre uma Session síncrona (SQLite em memória)"""
+
+    def __init__(self, session: Session):
+        self._session = session
+
+    async def execute(self, stmt):
+        return self._session.execute(stmt)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(
+            Vehicle(brand='Fiat', model='Uno', year=2020, color='Branco', price=price)
+            for price in _PRICES
+        )
+        session.add(Vehicle(brand='Fiat', model='Uno', year=2020, color='Branco', price=15000.0,
+                            status=VehicleStatus.SOLD))
+        session.commit()
+        yield _AsyncSessionAdapter(session)
+
+
+async def _page(db, size, after_price=None, after_id=None, status=VehicleStatus.AVAILABLE):
+    response = Response()
+    rows = await list_vehicles(
+        response=response, status=status, after_price=after_price, after_id=after_id,
+        page=None, size=size, db=db,
+    )
+    return rows, response.headers
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 4, 11, 50])
+async def test_cursor_pages_neither_overlap_nor_skip(db, size):
+    seen = []
+    after_price = after_id = None
+    while True:
+        rows, headers = await _page(db, size, after_price, after_id)
+        seen.extend(row.id for row in rows)
+        if 'X-Next-After-Id' not in headers:
+            break
+        after_price, after_id = float(headers['X-Next-After-Price']), int(headers['X-Next-After-Id'])
+
+    # ids seguem a ordem de inserção de _PRICES; ordem esperada: (price, id)
+    expected = sorted(range(1, len(_PRICES) + 1), key=lambda vehicle_id: (_PRICES[vehicle_id - 1], vehicle_id))
+    assert seen == expected
+
+
+async def test_last_page_has_no_cursor(db):
+    rows, headers = await _page(db, len(_PRICES) + 1)
+
+    assert len(rows) == len(_PRICES)
+    assert 'X-Next-After-Id' not in headers
+
+
+async def test_empty_page_has_no_cursor(db):
+    last_price = max(_PRICES)
+    rows, headers = await _page(db, 5, after_price=last_price, after_id=10 ** 6)
+
+    assert rows == []
+    assert 'X-Next-After-Id' not in headers
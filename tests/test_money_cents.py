@@ -0,0 +1,48 @@
+"""Preços e valores guardados em centavos inteiros: Decimal -> centavos -> Decimal"""
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from src.entities.sale import Sale
+from src.entities.vehicle import Vehicle
+
+
+@pytest.mark.parametrize('value', ['0.01', '1.10', '1234.56', '99999.99', '9999999.99'])
+def test_sale_amount_round_trips_through_cents(value, valid_cpf):
+    sale = Sale(vehicle_id=1, customer_cpf=valid_cpf, sale_date=datetime.now(), amount=Decimal(value))
+
+    assert sale.amount == Decimal(value)
+    assert sale.amount_float == float(Decimal(value))
+    assert Sale.from_row({'id': 1, 'vehicle_id': 1, 'customer_cpf': valid_cpf,
+                          'sale_date': sale.sale_date, 'amount': sale.amount,
+                          'payment_status': 'pending'}).amount == Decimal(value)
+
+
+@pytest.mark.parametrize('value', ['0.01', '1.10', '1234.56', '99999.99'])
+def test_vehicle_price_round_trips_through_row(value):
+    vehicle = Vehicle(brand='Toyota', model='Corolla', year=2022, price=Decimal(value), color='Prata')
+
+    row = vehicle.to_row()
+
+    assert row['price'] == Decimal(value)
+    assert Vehicle.from_row(row).price == Decimal(value)
+    assert vehicle.price_float == float(Decimal(value))
+
+
+@pytest.mark.parametrize('value, expected', [
+    (Decimal('10.005'), Decimal('10.00')),  # ROUND_HALF_EVEN, como o quantize
+    (Decimal('10.015'), Decimal('10.02')),
+    (19.99, Decimal('19.99')),              # float passa por str, sem erro binário
+    (20, Decimal('20.00')),
+])
+def test_amount_is_rounded_once_to_cents(value, expected, valid_cpf):
+    sale = Sale(vehicle_id=1, customer_cpf=valid_cpf, sale_date=datetime.now(), amount=value)
+
+    assert sale.amount == expected
+
+
+@pytest.mark.parametrize('value', [Decimal('0'), Decimal('0.004'), Decimal('10000000.00')])
+def test_amount_out_of_range_is_rejected(value, valid_cpf):
+    with pytest.raises(ValueError):
+        Sale(vehicle_id=1, customer_cpf=valid_cpf, sale_date=datetime.now(), amount=value)
@@ -0,0 +1,90 @@
+"""Fluxos de venda: compare-and-set do status de pagamento, webhook repetido e venda com trava"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.entities.sale import PaymentStatus
+from src.gateways.sale_gateway import SaleGateway
+from src.gateways.vehicle_gateway import VehicleGateway
+from src.use_cases.sale_use_cases import (
+    CreateSaleUseCase,
+    ProcessPaymentWebhookUseCase,
+    UpdatePaymentStatusUseCase,
+)
+
+
+async def test_payment_status_conflict_raises(sale_repository):
+    sale_repository.add(1)
+    gateway = SaleGateway(sale_repository)
+    sale = await gateway.find_sale_by_id(1)
+
+    # Outra requisição rejeita a venda entre a leitura e a escrita
+    sale_repository.rows[1]['payment_status'] = 'rejected'
+    sale.approve_payment()
+
+    with pytest.raises(ValueError, match='alterado por outra operação'):
+        await gateway.update_sale_payment_status(sale, PaymentStatus.PENDING)
+    assert sale_repository.rows[1]['payment_status'] == 'rejected'
+
+
+async def test_payment_status_update_is_a_single_conditional_write(sale_repository):
+    sale_repository.add(1)
+
+    sale = await UpdatePaymentStatusUseCase(SaleGateway(sale_repository)).execute(1, 'approved')
+
+    assert sale.payment_status is PaymentStatus.APPROVED
+    assert sale_repository.rows[1]['payment_status'] == 'approved'
+    assert sale_repository.status_writes == 1
+
+
+async def test_replayed_webhook_is_a_no_op(sale_repository):
+    sale_repository.add(1)
+    use_case = ProcessPaymentWebhookUseCase(SaleGateway(sale_repository))
+
+    first = await use_case.execute({'sale_id': 1, 'status': 'approved'})
+    updated_at = sale_repository.rows[1]['updated_at']
+    replay = await use_case.execute({'sale_id': 1, 'status': 'approved'})
+
+    assert first['success'] and replay['success']
+    assert replay['current_status'] == 'approved'
+    assert sale_repository.status_writes == 1
+    assert sale_repository.rows[1]['updated_at'] == updated_at
+
+
+async def test_old_sales_load_without_revalidation(sale_repository):
+    sale_repository.add(1, sale_date=datetime.now() - timedelta(days=90))
+    gateway = SaleGateway(sale_repository)
+
+    assert (await gateway.find_sale_by_id(1)).id == 1
+    assert [sale.id for sale in await gateway.find_all_sales()] == [1]
+
+
+async def test_create_sale_locks_vehicle_and_marks_it_sold(vehicle_repository, sale_repository, valid_cpf):
+    vehicle_repository.add(1)
+    use_case = CreateSaleUseCase(SaleGateway(sale_repository), VehicleGateway(vehicle_repository))
+
+    sale = await use_case.execute(vehicle_id=1, customer_cpf=valid_cpf, amount=50000)
+
+    assert sale.payment_status is PaymentStatus.PENDING
+    assert vehicle_repository.locked_reads == [1]
+    assert vehicle_repository.rows[1]['status'] == 'sold'
+
+
+async def test_second_sale_of_the_same_vehicle_is_rejected(vehicle_repository, sale_repository, valid_cpf):
+    vehicle_repository.add(1)
+    use_case = CreateSaleUseCase(SaleGateway(sale_repository), VehicleGateway(vehicle_repository))
+    await use_case.execute(vehicle_id=1, customer_cpf=valid_cpf, amount=50000)
+
+    with pytest.raises(ValueError, match='não está disponível'):
+        await use_case.execute(vehicle_id=1, customer_cpf=valid_cpf, amount=50000)
+    assert len(sale_repository.rows) == 1
+
+
+async def test_sale_is_rejected_when_vehicle_already_has_one(vehicle_repository, sale_repository, valid_cpf):
+    vehicle_repository.add(1)
+    vehicle_repository.sale_ids[1] = 99
+    use_case = CreateSaleUseCase(SaleGateway(sale_repository), VehicleGateway(vehicle_repository))
+
+    with pytest.raises(ValueError, match='já possui uma venda'):
+        await use_case.execute(vehicle_id=1, customer_cpf=valid_cpf, amount=50000)
+    assert not sale_repository.rows
@@ -0,0 +1,11 @@
+"""O warmup dos schemas de app/ passa pelo caminho de sucesso de cada validador"""
+from app.domain.schemas import _WARMUP_PAYLOADS, warmup
+
+
+def test_warmup_payloads_are_valid():
+    for schema, payload in _WARMUP_PAYLOADS:
+        assert schema.model_validate(payload).model_dump(by_alias=True)
+
+
+def test_warmup_runs():
+    warmup()
@@ -0,0 +1,57 @@
+"""Cache por worker das listagens por status: invalidado só depois do commit da escrita"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.external.database import vehicle_repository as repository
+
+_KEY = ('available', 100, 0)
+
+
+@pytest.fixture
+def session():
+    repository._status_list_cache.clear()
+    with Session(create_engine('sqlite://')) as session:
+        yield session
+    repository._status_list_cache.clear()
+
+
+def test_write_invalidates_only_after_commit(session):
+    repository._store_status_list(_KEY, repository._status_list_generation, [{'id': 1}])
+
+    repository._invalidate_status_lists_after_commit(session)
+    repository._invalidate_status_lists_after_commit(session)
+    assert _KEY in repository._status_list_cache
+
+    session.commit()
+    assert _KEY not in repository._status_list_cache
+
+
+def test_rolled_back_write_keeps_the_cache(session):
+    repository._store_status_list(_KEY, repository._status_list_generation, [{'id': 1}])
+
+    repository._invalidate_status_lists_after_commit(session)
+    session.rollback()
+
+    assert _KEY in repository._status_list_cache
+
+
+def test_read_overlapping_a_commit_is_not_cached(session):
+    generation = repository._status_list_generation  # leitura começa
+
+    repository._invalidate_status_lists_after_commit(session)
+    session.commit()  # escrita concorrente confirma antes de a leitura terminar
+    repository._store_status_list(_KEY, generation, [{'id': 1}])
+
+    assert _KEY not in repository._status_list_cache
+
+
+def test_next_transaction_schedules_a_new_invalidation(session):
+    repository._invalidate_status_lists_after_commit(session)
+    session.commit()
+    repository._store_status_list(_KEY, repository._status_list_generation, [{'id': 1}])
+
+    repository._invalidate_status_lists_after_commit(session)
+    session.commit()
+
+    assert _KEY not in repository._status_list_cache
@@ -0,0 +1,36 @@
+"""Escritas de veículo pedem a linha com trava (for_update) antes de gravar"""
+from decimal import Decimal
+
+import pytest
+
+from src.gateways.vehicle_gateway import VehicleGateway
+from src.use_cases.vehicle_use_cases import MarkVehicleAsSoldUseCase, UpdateVehicleUseCase
+
+
+async def test_update_locks_the_row_and_applies_all_fields(vehicle_repository):
+    vehicle_repository.add(1)
+
+    vehicle = await UpdateVehicleUseCase(VehicleGateway(vehicle_repository)).execute(
+        1, color='Preto', price=Decimal('45000.50')
+    )
+
+    assert vehicle_repository.locked_reads == [1]
+    assert vehicle.color == 'Preto'
+    assert vehicle_repository.rows[1]['price'] == Decimal('45000.50')
+
+
+async def test_mark_as_sold_locks_the_row(vehicle_repository):
+    vehicle_repository.add(1)
+
+    await MarkVehicleAsSoldUseCase(VehicleGateway(vehicle_repository)).execute(1)
+
+    assert vehicle_repository.locked_reads == [1]
+    assert vehicle_repository.rows[1]['status'] == 'sold'
+
+
+async def test_update_with_invalid_field_writes_nothing(vehicle_repository):
+    row = dict(vehicle_repository.add(1))
+
+    with pytest.raises(ValueError):
+        await UpdateVehicleUseCase(VehicleGateway(vehicle_repository)).execute(1, color='Preto', year=1800)
+    assert vehicle_repository.rows[1] == row